@@ -9,16 +9,33 @@ import sys
 from pathlib import Path
 from typing import assert_never
 
-from hibob_monitor.cookies import SupportedBrowser
-
-from .auth import authenticate_with_browser
-from .cache import get_latest_cache, save_cache
-from .change_detection import compare_employee_lists
-from .cli import StdOutOutputInfo, create_argument_parser, show_setup_help
+from .cache import (
+    CacheStore,
+    get_cache_index_file,
+    get_latest_cache_index,
+    get_latest_response_validators,
+    is_cache_recent,
+)
+from .change_detection import (
+    build_employee_hash_index,
+    compare_employee_lists,
+    has_same_content,
+)
+from .cli import (
+    StdOutOutputInfo,
+    create_argument_parser,
+    is_setup_help_requested,
+    show_setup_help,
+)
 from .config import DEFAULT_CACHE_CONFIG
-from .domain_utils import build_base_url
-from .employees import get_active_employees
-from .models import ChangeReport, EmployeeList
+from .cookies import SupportedBrowser
+from .models import (
+    ChangeReport,
+    EmployeeHashIndex,
+    EmployeeList,
+    NotModified,
+    ResponseValidators,
+)
 from .output import (
     OutputFormat,
     append_to_file,
@@ -29,9 +46,34 @@ from .output import (
 logger = logging.getLogger(__name__)
 
 
-def setup_logging() -> None:
+def setup_logging(*, quiet: bool = False) -> None:
     """Setup logging to stderr."""
-    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    logging.basicConfig(
+        level=logging.WARNING if quiet else logging.INFO,
+        format="%(message)s",
+        stream=sys.stderr,
+    )
+
+
+def log_run_settings(
+    domain: str,
+    browser: SupportedBrowser,
+    cache_file: Path,
+    log_file: Path,
+    *,
+    enable_change_tracking: bool,
+) -> None:
+    """Log the settings the monitor runs with."""
+    logger.info("🔍 HiBob Employee Monitor")
+    logger.info("📍 Domain: %s", domain)
+    logger.info("🌐 Browser: %s", browser.value.title())
+
+    if enable_change_tracking:
+        logger.info(
+            "📝 Change tracking: enabled (cache: %s, log: %s)", cache_file, log_file
+        )
+    else:
+        logger.info("📝 Change tracking: disabled")
 
 
 def run_hibob_monitor(  # noqa: PLR0913
@@ -43,22 +85,38 @@ def run_hibob_monitor(  # noqa: PLR0913
     employee_list_path: Path | None = None,
     output: StdOutOutputInfo = StdOutOutputInfo.CHANGES,
     *,
+    auth_cache_file: Path | None = None,
     enable_change_tracking: bool = True,
 ) -> None:
     """Main application logic with change tracking."""
+    log_run_settings(
+        domain,
+        browser,
+        cache_file,
+        log_file,
+        enable_change_tracking=enable_change_tracking,
+    )
 
-    logger.info("🔍 HiBob Employee Monitor")
-    logger.info("📍 Domain: %s", domain)
-    logger.info("🌐 Browser: %s", browser.value.title())
-
-    msg = (
-        f"enabled (cache: {cache_file}, log: {log_file})"
-        if enable_change_tracking
-        else "disabled"
+    validators = (
+        get_latest_response_validators(cache_file) if enable_change_tracking else None
     )
-    logger.info("📝 Change tracking: %s", msg)
+    fetch_result = fetch_new_employee_list(domain, browser, auth_cache_file, validators)
+    # Shared by the change detection and the save, so the cache is read only once
+    cache = CacheStore(cache_file, DEFAULT_CACHE_CONFIG)
 
-    employee_list = fetch_new_employee_list(domain, browser)
+    check_changes = enable_change_tracking
+    if isinstance(fetch_result, NotModified):
+        logger.info("✅ No changes detected since last run")
+        cache.refresh()
+        if not employee_list_path and output != StdOutOutputInfo.EMPLOYEE_LIST:
+            return
+        employee_list, fetched_again = get_unchanged_employee_list(
+            cache, domain, browser, auth_cache_file
+        )
+        # The latest cache is still up to date: nothing to compare or save
+        check_changes = enable_change_tracking and fetched_again
+    else:
+        employee_list = fetch_result
 
     if not employee_list:
         logger.error("❌ No active employees found.")
@@ -66,21 +124,21 @@ def run_hibob_monitor(  # noqa: PLR0913
 
     logger.info("📊 Found %s active employees", employee_list.count)
 
-    formatted_list = list_format.format(employee_list)
+    # Formatting can be costly: skip it when the list is neither saved nor printed
+    formatted_list = (
+        list_format.format(employee_list)
+        if employee_list_path or output == StdOutOutputInfo.EMPLOYEE_LIST
+        else ""
+    )
     if employee_list_path:
-        logger.info(employee_list_path)
-        success = write_to_file(formatted_list, employee_list_path)
-        if success:
-            logger.info(
-                "📄 Employee list saved as %s to %s",
-                list_format.value,
-                employee_list_path,
-            )
+        save_employee_list(formatted_list, list_format, employee_list_path)
 
     # Handle change tracking
     change_report_text = None
-    if enable_change_tracking:
-        change_report_text = get_change_report(employee_list, cache_file, log_file)
+    if check_changes:
+        change_report_text = get_change_report(
+            employee_list, cache, log_file, previous_validators=validators
+        )
 
     match output:
         case StdOutOutputInfo.CHANGES:
@@ -94,12 +152,56 @@ def run_hibob_monitor(  # noqa: PLR0913
             assert_never(output)
 
 
+def get_unchanged_employee_list(
+    cache: CacheStore,
+    domain: str,
+    browser: SupportedBrowser,
+    auth_cache_file: Path | None,
+) -> tuple[EmployeeList | None, bool]:
+    """Get the employee list the server reported as unchanged.
+
+    It is read from the latest cache, or fetched again without validators if
+    the cache lost it while its index survived (e.g. it was truncated). Also
+    returns whether it had to be fetched again.
+    """
+    employee_list = cache.get_latest()
+    if employee_list is not None:
+        return employee_list, False
+
+    logger.warning("⚠️  Cached employee list not found, fetching it again")
+    # The orphaned index would make the fetched list look unchanged, and unsaved
+    get_cache_index_file(cache.cache_file).unlink(missing_ok=True)
+    fetch_result = fetch_new_employee_list(domain, browser, auth_cache_file)
+    if isinstance(fetch_result, NotModified):
+        return None, True
+    return fetch_result, True
+
+
+def save_employee_list(
+    formatted_list: str, list_format: OutputFormat, employee_list_path: Path
+) -> None:
+    """Save the formatted employee list to a file."""
+    logger.info(employee_list_path)
+    success = write_to_file(formatted_list, employee_list_path)
+    if success:
+        logger.info(
+            "📄 Employee list saved as %s to %s",
+            list_format.value,
+            employee_list_path,
+        )
+
+
 def get_change_report(
-    employee_list: EmployeeList, cache_file: Path, log_file: Path
+    employee_list: EmployeeList,
+    cache: CacheStore,
+    log_file: Path,
+    *,
+    previous_validators: ResponseValidators | None = None,
 ) -> str | None:
     change_report_text = None
     logger.info("\n🔄 Checking for changes...")
-    change_report = get_changes_since_latest_cache(employee_list, cache_file)
+    hash_index = build_employee_hash_index(employee_list)
+    change_report = get_changes_since_latest_cache(employee_list, cache, hash_index)
 
     if change_report is None:
         logger.info("📥 First run - creating initial cache")
@@ -123,15 +225,32 @@ def get_change_report(
         else:
             logger.warning("⚠️  Warning: Could not write to log file %s", log_file)
 
-    save_cache(employee_list, cache_file, DEFAULT_CACHE_CONFIG)
+    # Rewriting an unchanged cache is wasted work, unless it's getting old
+    if (
+        change_report is None
+        or change_report.has_changes
+        or not is_cache_recent(cache.cache_file, cache.config)
+    ):
+        cache.save(employee_list, hash_index)
+    elif hash_index.validators != previous_validators:
+        # Same data behind new validators: remember them for the next request
+        cache.save_index(hash_index)
     return change_report_text
 
 
 def fetch_new_employee_list(
-    domain: str, browser: SupportedBrowser
-) -> EmployeeList | None:
+    domain: str,
+    browser: SupportedBrowser,
+    auth_cache_file: Path | None = None,
+    validators: ResponseValidators | None = None,
+) -> EmployeeList | NotModified | None:
+    # Only needed once we actually fetch: keep them out of --help/--setup-help
+    from .auth import authenticate_with_browser  # noqa: PLC0415
+    from .domain_utils import build_base_url  # noqa: PLC0415
+    from .employees import get_active_employees  # noqa: PLC0415
+
     # Authenticate
-    success, cookies = authenticate_with_browser(domain, browser)
+    success, cookies = authenticate_with_browser(domain, browser, auth_cache_file)
 
     if not success:
         logger.error("\n❌ Authentication failed.")
@@ -143,52 +262,48 @@ def fetch_new_employee_list(
     # Fetch employees
     logger.info("\n🔍 Fetching active employees...")
     base_url = build_base_url(domain)
-    return get_active_employees(base_url, cookies)
+    return get_active_employees(base_url, cookies, validators)
 
 
 def get_changes_since_latest_cache(
-    employee_list: EmployeeList, cache_file: Path
+    employee_list: EmployeeList,
+    cache: CacheStore,
+    hash_index: EmployeeHashIndex | None = None,
 ) -> ChangeReport | None:
-    """Get changes since the latest cache."""
-    previous_employee_list = get_latest_cache(cache_file)
-    if previous_employee_list is not None:
-        return compare_employee_lists(employee_list, previous_employee_list)
-    return None
-
-
-def get_change_report_since_latest_run(
-    employee_list: EmployeeList, cache_file: Path
-) -> ChangeReport | None:
-    """Get the change report since the latest run."""
-    logger.info("\n🔄 Checking for changes...")
-    previous_employee_list = get_latest_cache(cache_file)
+    """Get changes since the latest cache.
+
+    If the hash index of employee_list is given and matches the cached one, the
+    (much bigger) cached employee list isn't even loaded.
+    """
+    previous_hash_index = None
+    if hash_index is not None:
+        previous_hash_index = get_latest_cache_index(cache.cache_file)
+        if previous_hash_index is not None and has_same_content(
+            hash_index, previous_hash_index
+        ):
+            return ChangeReport(
+                current_timestamp=employee_list.timestamp,
+                previous_timestamp=previous_hash_index.timestamp,
+            )
 
+    previous_employee_list = cache.get_latest()
     if previous_employee_list is not None:
-        change_report = compare_employee_lists(employee_list, previous_employee_list)
-
-        if change_report.has_changes:
-            logger.info(
-                "📈 Changes detected: %s added, %s removed, %s modified",
-                len(change_report.added),
-                len(change_report.removed),
-                len(change_report.modified),
-            )
-        else:
-            logger.info("✅ No changes detected since last run")
-        return change_report
+        return compare_employee_lists(
+            employee_list, previous_employee_list, previous_hash_index
+        )
     return None
 
 
 def main() -> None:
     """Main function."""
-    setup_logging()
+    if is_setup_help_requested():
+        show_setup_help()
+        return
 
     parser = create_argument_parser()
     args = parser.parse_args()
 
-    if args.setup_help:
-        show_setup_help()
-        return
+    setup_logging(quiet=args.quiet)
 
     if not args.domain:
         parser.error("--domain is required (use --setup-help for setup instructions)")
@@ -205,6 +320,7 @@ def main() -> None:
         enable_change_tracking=not args.disable_change_tracking,
         cache_file=args.cache_file,
         log_file=args.log_file,
+        auth_cache_file=None if args.disable_auth_cache else args.auth_cache_file,
     )
 
 
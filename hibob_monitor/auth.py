@@ -2,61 +2,142 @@
 Authentication functionality
 """
 
+import json
 import logging
-from functools import partial
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from .config import TEST_ENDPOINTS
+from .config import AUTH_CACHE_TTL_SECONDS, TEST_ENDPOINTS
 from .cookies import (
     SupportedBrowser,
     extract_cookies_from_browser,
     filter_auth_cookies,
 )
 from .domain_utils import build_base_url, normalize_domain
-from .http_utils import make_request
+from .file_utils import ensure_parent_directory, write_atomically
+from .http_utils import make_request, warm_up_connection
 
 logger = logging.getLogger(__name__)
 
 
-def _test_endpoint(base_url: str, endpoint: str, cookies: dict[str, str]) -> bool:
-    """Test if endpoint works with current cookies."""
-    url = f"{base_url}{endpoint}"
-    result = make_request(url, cookies)
-    return result is not None
-
-
-def test_authentication(base_url: str, cookies: dict[str, str]) -> bool:
-    """Test if current session is authenticated."""
-    test_functions = [
-        partial(_test_endpoint, base_url, endpoint, cookies)
-        for endpoint in TEST_ENDPOINTS
-    ]
-
-    for i, test_func in enumerate(test_functions):
-        if test_func():
-            logger.info(
-                "✅ Authentication successful! (endpoint: %s)", TEST_ENDPOINTS[i]
-            )
-            return True
-
-    logger.error("❌ Authentication test failed on all endpoints")
-    return False
+def _authenticate(
+    base_url: str, cookies: dict[str, str], preferred_endpoint: str | None = None
+) -> str | None:
+    """Test if current session is authenticated, returning the working endpoint.
+
+    The endpoints are tried one at a time, each one being a full request, the
+    preferred endpoint (the one that worked last time) first.
+    """
+    # Stable sort: the preferred endpoint first, the others in their order
+    endpoints = sorted(TEST_ENDPOINTS, key=lambda e: e != preferred_endpoint)
+    for endpoint in endpoints:
+        if make_request(f"{base_url}{endpoint}", cookies) is not None:
+            logger.info("✅ Authentication successful! (endpoint: %s)", endpoint)
+            return endpoint
+    return None
+
+
+def _auth_cache_key(browser: SupportedBrowser, normalized_domain: str) -> str:
+    """Build the auth cache key for a browser and domain."""
+    return f"{browser.value}:{normalized_domain}"
+
+
+def _load_auth_cache(auth_cache_file: Path) -> dict[str, object]:
+    """Load the whole auth cache, returning an empty one on any error."""
+    if not auth_cache_file.exists():
+        return {}
+    try:
+        with auth_cache_file.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(
+            "⚠️  Warning: Could not load auth cache from %s: %s", auth_cache_file, e
+        )
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _get_fresh_cookies(entry: dict[str, object]) -> dict[str, str] | None:
+    """Get the cookies of an auth cache entry, if still fresh."""
+    expires_at = entry.get("expires_at")
+    cookies = entry.get("cookies")
+    if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+        return None
+    if not isinstance(cookies, dict) or not cookies:
+        return None
+    return {str(name): str(value) for name, value in cookies.items()}
+
+
+def _get_cached_endpoint(entry: dict[str, object]) -> str | None:
+    """Get the endpoint that last authenticated, kept even once cookies expire."""
+    endpoint = entry.get("endpoint")
+    return endpoint if isinstance(endpoint, str) else None
+
+
+def _save_auth_cache_entry(
+    auth_cache_file: Path, key: str, cookies: dict[str, str], endpoint: str
+) -> None:
+    """Store authentication cookies and working endpoint for key."""
+    auth_cache = _load_auth_cache(auth_cache_file)
+    auth_cache[key] = {
+        "cookies": cookies,
+        "endpoint": endpoint,
+        "expires_at": time.time() + AUTH_CACHE_TTL_SECONDS,
+    }
+    try:
+        ensure_parent_directory(auth_cache_file)
+        # The file holds session cookies: keep it private to the current user
+        write_atomically(
+            auth_cache_file, json.dumps(auth_cache).encode("utf-8"), mode=0o600
+        )
+    except OSError as e:
+        logger.warning(
+            "⚠️  Warning: Could not save auth cache to %s: %s", auth_cache_file, e
+        )
 
 
 def authenticate_with_browser(
-    domain: str, browser: SupportedBrowser
+    domain: str,
+    browser: SupportedBrowser,
+    auth_cache_file: Path | None = None,
 ) -> tuple[bool, dict[str, str]]:
-    """Complete authentication flow using browser cookies."""
+    """Complete authentication flow using browser cookies.
+
+    If auth_cache_file is given, cookies from a previous run are reused while
+    they are fresh and still authenticate, skipping the browser extraction, and
+    the endpoint that authenticated last time is tried first.
+    """
     normalized_domain = normalize_domain(domain)
     base_url = build_base_url(domain)
 
+    cache_key = _auth_cache_key(browser, normalized_domain)
+    cache_entry: dict[str, object] = {}
+    if auth_cache_file is not None:
+        entry = _load_auth_cache(auth_cache_file).get(cache_key)
+        # A corrupt entry is as good as none: fall back to the browser
+        if isinstance(entry, dict):
+            cache_entry = entry
+    preferred_endpoint = _get_cached_endpoint(cache_entry)
+
+    cached_cookies = _get_fresh_cookies(cache_entry)
+    if cached_cookies is not None:
+        logger.info("🔑 Trying cached authentication cookies...")
+        if _authenticate(base_url, cached_cookies, preferred_endpoint) is not None:
+            return True, cached_cookies
+        # Not an error yet: the browser may well have fresh cookies
+        logger.info("🔑 Cached authentication cookies were rejected")
+
     logger.info(
         "🔍 Extracting cookies from %s for %s...",
         browser.value.title(),
         normalized_domain,
     )
 
-    # Extract and filter cookies
-    all_cookies = extract_cookies_from_browser(browser, normalized_domain)
+    # Extract and filter cookies, connecting to HiBob in the meantime
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(warm_up_connection, base_url)
+        all_cookies = extract_cookies_from_browser(browser, normalized_domain)
 
     if not all_cookies:
         logger.error("❌ No cookies found in %s.", browser.value.title())
@@ -79,6 +160,10 @@ def authenticate_with_browser(
     )
 
     # Test authentication
-    if test_authentication(base_url, auth_cookies):
+    endpoint = _authenticate(base_url, auth_cookies, preferred_endpoint)
+    if endpoint is not None:
+        if auth_cache_file is not None:
+            _save_auth_cache_entry(auth_cache_file, cache_key, auth_cookies, endpoint)
         return True, auth_cookies
+    logger.error("❌ Authentication test failed on all endpoints")
     return False, {}
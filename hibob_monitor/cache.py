@@ -4,86 +4,271 @@ Cache management for employee data with smart deduplication
 
 import json
 import logging
-from dataclasses import dataclass
+import os
+import time
+from dataclasses import dataclass, field
+from itertools import groupby
 from pathlib import Path
+from typing import Any
 
-from .models import EmployeeList
+from .file_utils import ensure_parent_directory, write_atomically
+from .models import EmployeeHashIndex, EmployeeList, ResponseValidators
 
 logger = logging.getLogger(__name__)
 
+# Size of the blocks the latest cache entry is read backwards in
+_READ_CHUNK_SIZE = 64 * 1024
+
+# The old single JSON document caches were always written indented (with
+# Windows line endings if written there in text mode)
+_LEGACY_CACHE_PREFIXES = (b"{\n", b"{\r\n")
+
 
 @dataclass
 class CacheConfig:
     """Configuration for cache management."""
 
+    # Entries kept on compaction. Saves only append until the file holds twice
+    # as many, so it may hold up to 2 * max_entries entries in between.
     max_entries: int = 5
     deduplicate_consecutive: bool = True
+    durable: bool = False
+    # Unchanged data is still saved if the cache is older than this (only
+    # touched if the server confirmed it unchanged)
+    force_refresh_after_seconds: float = 0
 
 
-def _deduplicate_consecutive(entries: list[EmployeeList]) -> list[EmployeeList]:
-    """Remove consecutive duplicate entries, keeping only first and last."""
-    if not entries:
-        return entries
+@dataclass
+class _CacheEntry:
+    """A cache entry, with the JSON line it was read from or written as."""
 
-    deduplicated = []
-    current_group = [entries[0]]
-
-    for entry in entries[1:]:
-        if entry == current_group[-1]:  # Same employee data
-            current_group.append(entry)
-        else:
-            # End of current group, add first and last if different
-            if len(current_group) == 1:
-                deduplicated.append(current_group[0])
-            else:
-                deduplicated.append(current_group[0])  # First (oldest)
-                deduplicated.append(current_group[-1])  # Last (newest)
-            current_group = [entry]
+    data: dict[str, Any]
+    line: bytes | None = None
 
-    # Handle the last group
-    if len(current_group) == 1:
-        deduplicated.append(current_group[0])
-    else:
-        deduplicated.append(current_group[0])  # First (oldest)
-        deduplicated.append(current_group[-1])  # Last (newest)
+    def serialize(self) -> bytes:
+        """Get the entry as a single JSON line, only encoding it once."""
+        if self.line is None:
+            self.line = json.dumps(self.data, ensure_ascii=False).encode("utf-8")
+        return self.line
 
+
+def _deduplicate_consecutive(entries: list[_CacheEntry]) -> list[_CacheEntry]:
+    """Remove consecutive duplicate entries, keeping only first and last."""
+    deduplicated = []
+    # Grouped by their employee data
+    for _, group in groupby(entries, key=lambda entry: entry.data.get("employees")):
+        first, *rest = group
+        deduplicated.append(first)  # First (oldest)
+        if rest:
+            deduplicated.append(rest[-1])  # Last (newest)
     return deduplicated
 
 
-def load_cache(cache_file: Path) -> list[EmployeeList]:
-    """Load cached employee data history from JSON file."""
+def _append_line(path: Path, line: bytes, *, durable: bool = False) -> None:
+    """Append a single line to path with one write.
+
+    The data is only fsync'ed to disk if durable is set.
+    """
+    with path.open("a+b") as f:
+        # Don't glue the line to an incomplete one left by an interrupted append
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line + b"\n")
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _read_last_line(path: Path) -> bytes:
+    """Read the last non-empty line of a file, reading it backwards in chunks."""
+    chunks: list[bytes] = []
+    found_content = False
+    with path.open("rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        while position > 0:
+            size = min(_READ_CHUNK_SIZE, position)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size)
+            if not found_content:
+                chunk = chunk.rstrip(b"\n")
+                found_content = bool(chunk)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                chunks.append(chunk[newline + 1 :])
+                break
+            chunks.append(chunk)
+    return b"".join(reversed(chunks))
+
+
+def _count_lines(path: Path) -> int:
+    """Count the lines of a file, reading it in chunks."""
+    count = 0
+    last_chunk = b""
+    with path.open("rb") as f:
+        while chunk := f.read(_READ_CHUNK_SIZE):
+            count += chunk.count(b"\n")
+            last_chunk = chunk
+    # A last line without its newline (e.g. an interrupted append)
+    if last_chunk and not last_chunk.endswith(b"\n"):
+        count += 1
+    return count
+
+
+def _is_legacy_cache(cache_file: Path) -> bool:
+    """Whether the cache is in the old single JSON document format."""
+    try:
+        with cache_file.open("rb") as f:
+            return f.read(3).startswith(_LEGACY_CACHE_PREFIXES)
+    except OSError:
+        return False
+
+
+def _load_cache_entries(cache_file: Path) -> list[_CacheEntry]:
+    """Load the raw (unparsed) cache entries from the JSON lines file.
+
+    Lines that can't be parsed (e.g. an append interrupted by a crash) are
+    skipped. Caches in the old single JSON document format are still read.
+    """
     if not cache_file.exists():
         return []
 
     try:
-        with cache_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            entries_data = data.get("entries", [])
-            return [EmployeeList.from_dict(entry_data) for entry_data in entries_data]
+        # Slurping the file and parsing the bytes is faster than json.load
+        content = cache_file.read_bytes()
+        if content.startswith(_LEGACY_CACHE_PREFIXES):
+            return [
+                _CacheEntry(entry_data)
+                for entry_data in json.loads(content).get("entries", [])
+            ]
     except (OSError, json.JSONDecodeError) as e:
         logger.warning("⚠️  Warning: Could not load cache from %s: %s", cache_file, e)
         return []
 
+    entries = []
+    for line in content.splitlines():
+        if not line:
+            continue
+        try:
+            entries.append(_CacheEntry(json.loads(line), line))
+        except json.JSONDecodeError as e:
+            logger.warning(
+                "⚠️  Warning: Skipping invalid cache entry in %s: %s", cache_file, e
+            )
+    return entries
+
+
+def load_cache(cache_file: Path) -> list[EmployeeList]:
+    """Load cached employee data history from JSON lines file."""
+    return [
+        EmployeeList.from_dict(entry.data) for entry in _load_cache_entries(cache_file)
+    ]
+
 
 def get_latest_cache(cache_file: Path) -> EmployeeList | None:
     """Get the most recent cached employee list."""
-    entries = load_cache(cache_file)
-    return entries[-1] if entries else None
+    return CacheStore(cache_file).get_latest()
 
 
-def save_cache(
-    employee_list: EmployeeList, cache_file: Path, config: CacheConfig | None = None
-) -> None:
-    """Save employee data to cache with smart deduplication."""
-    if config is None:
-        config = CacheConfig()
+def get_cache_index_file(cache_file: Path) -> Path:
+    """Get the path of the hash index stored next to a cache file."""
+    return cache_file.with_name(f"{cache_file.stem}.index.json")
+
+
+def get_latest_cache_index(cache_file: Path) -> EmployeeHashIndex | None:
+    """Get the hash index of the most recent cached employee list.
+
+    The index is much smaller than the cache itself, so it is the cheap way to
+    find out whether anything changed since the latest run.
+    """
+    index_file = get_cache_index_file(cache_file)
+    if not index_file.exists() or not cache_file.exists():
+        return None
 
     try:
-        # Load existing cache
-        existing_entries = load_cache(cache_file)
+        return EmployeeHashIndex.from_dict(json.loads(index_file.read_bytes()))
+    except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+        logger.warning(
+            "⚠️  Warning: Could not load cache index from %s: %s", index_file, e
+        )
+        return None
+
+
+def get_latest_response_validators(cache_file: Path) -> ResponseValidators | None:
+    """Get the HTTP validators of the response the latest cache was built from."""
+    hash_index = get_latest_cache_index(cache_file)
+    return hash_index.validators if hash_index is not None else None
+
+
+def is_cache_recent(cache_file: Path, config: CacheConfig) -> bool:
+    """Whether the cache was written within config.force_refresh_after_seconds."""
+    try:
+        age = time.time() - cache_file.stat().st_mtime
+    except OSError:
+        return False
+    return age < config.force_refresh_after_seconds
+
+
+@dataclass
+class CacheStore:
+    """The entries of a cache file, loaded at most once per run.
+
+    The cache is a JSON lines file with one entry per line, so saving a new
+    entry is a single append. Deduplication and trimming to max_entries only
+    rewrite the file once it holds twice as many entries, reusing the JSON
+    lines of the entries it keeps.
+    """
+
+    cache_file: Path
+    config: CacheConfig = field(default_factory=CacheConfig)
+    _entries: list[_CacheEntry] | None = field(default=None, init=False, repr=False)
+
+    def _get_entries(self) -> list[_CacheEntry]:
+        """Get the raw cache entries, loading them on first use."""
+        if self._entries is None:
+            self._entries = _load_cache_entries(self.cache_file)
+        return self._entries
+
+    def _count_entries(self) -> int:
+        """Count the cache entries, without loading them if not loaded yet."""
+        if self._entries is not None:
+            return len(self._entries)
+        return _count_lines(self.cache_file)
+
+    def _get_latest_entry_data(self) -> dict[str, Any] | None:
+        """Get the raw latest cache entry, reading only the last line if possible."""
+        if self._entries is None and self.cache_file.exists():
+            try:
+                if not _is_legacy_cache(self.cache_file):
+                    last_line = _read_last_line(self.cache_file)
+                    if not last_line:
+                        return None
+                    latest: dict[str, Any] = json.loads(last_line)
+                    return latest
+            except (OSError, json.JSONDecodeError):
+                pass  # Fall back to loading (and skipping invalid) entries
+
+        entries = self._get_entries()
+        return entries[-1].data if entries else None
+
+    def get_latest(self) -> EmployeeList | None:
+        """Get the most recent cached employee list."""
+        latest_entry_data = self._get_latest_entry_data()
+        # Only build the models for the entry we return
+        return (
+            EmployeeList.from_dict(latest_entry_data)
+            if latest_entry_data is not None
+            else None
+        )
+
+    def _compact(self, new_entry: _CacheEntry) -> None:
+        """Rewrite the cache deduplicated and trimmed, with a new entry."""
+        config = self.config
 
         # Add new entry
-        all_entries = [*existing_entries, employee_list]
+        all_entries = [*self._get_entries(), new_entry]
 
         # Apply deduplication if enabled
         if config.deduplicate_consecutive:
@@ -93,20 +278,99 @@ def save_cache(
         if len(all_entries) > config.max_entries:
             all_entries = all_entries[-config.max_entries :]
 
-        # Create directory if it doesn't exist
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        write_atomically(
+            self.cache_file,
+            b"".join(entry.serialize() + b"\n" for entry in all_entries),
+            durable=config.durable,
+        )
+        self._entries = all_entries
 
-        # Save to file
-        cache_data = {
-            "cache_config": {
-                "max_entries": config.max_entries,
-                "deduplicate_consecutive": config.deduplicate_consecutive,
-            },
-            "entries": [entry.to_dict() for entry in all_entries],
-        }
+    def save(
+        self,
+        employee_list: EmployeeList,
+        hash_index: EmployeeHashIndex | None = None,
+    ) -> None:
+        """Save employee data to cache with smart deduplication.
 
-        with cache_file.open("w", encoding="utf-8") as f:
-            json.dump(cache_data, f, indent=2, ensure_ascii=False)
+        If given, hash_index (the index of employee_list) is saved next to the
+        cache.
+        """
+        config = self.config
+        entry = _CacheEntry(employee_list.to_dict())
+
+        try:
+            # Create directory if it doesn't exist
+            ensure_parent_directory(self.cache_file)
+
+            # Drop the index first: should anything below fail, no index is
+            # better than one describing an older entry
+            get_cache_index_file(self.cache_file).unlink(missing_ok=True)
+
+            if _is_legacy_cache(self.cache_file) or (
+                self.cache_file.exists()
+                and self._count_entries() >= 2 * config.max_entries
+            ):
+                self._compact(entry)
+            else:
+                _append_line(self.cache_file, entry.serialize(), durable=config.durable)
+                if self._entries is not None:
+                    self._entries.append(entry)
+
+            if hash_index is not None:
+                self._write_index(hash_index)
+
+        except OSError as e:
+            logger.warning(
+                "⚠️  Warning: Could not save cache to %s: %s", self.cache_file, e
+            )
+
+    def _write_index(self, hash_index: EmployeeHashIndex) -> None:
+        """Write the hash index next to the cache."""
+        write_atomically(
+            get_cache_index_file(self.cache_file),
+            json.dumps(hash_index.to_dict(), ensure_ascii=False).encode("utf-8"),
+            durable=self.config.durable,
+        )
+
+    def save_index(self, hash_index: EmployeeHashIndex) -> None:
+        """Save only the hash index, for data that matches the latest entry.
+
+        This keeps the stored response validators current without touching the
+        (much bigger) cache.
+        """
+        try:
+            self._write_index(hash_index)
+        except OSError as e:
+            logger.warning(
+                "⚠️  Warning: Could not save cache index for %s: %s",
+                self.cache_file,
+                e,
+            )
+
+    def refresh(self) -> None:
+        """Mark the latest entry as still current, if the cache isn't recent.
+
+        For data the server confirmed unchanged: like saving it again, but
+        only the modification time of the cache needs updating.
+        """
+        if is_cache_recent(self.cache_file, self.config):
+            return
+        try:
+            os.utime(self.cache_file)
+        except OSError as e:
+            logger.warning(
+                "⚠️  Warning: Could not refresh cache %s: %s", self.cache_file, e
+            )
+
+
+def save_cache(
+    employee_list: EmployeeList,
+    cache_file: Path,
+    config: CacheConfig | None = None,
+    hash_index: EmployeeHashIndex | None = None,
+) -> None:
+    """Save employee data to cache with smart deduplication.
 
-    except OSError as e:
-        logger.warning("⚠️  Warning: Could not save cache to %s: %s", cache_file, e)
+    If given, hash_index (the index of employee_list) is saved next to the cache.
+    """
+    CacheStore(cache_file, config or CacheConfig()).save(employee_list, hash_index)
@@ -2,65 +2,167 @@
 Change detection and logging for employee data using structured models
 """
 
-from collections.abc import Container
+import hashlib
+import json
+from collections.abc import Iterable, Iterator
 from itertools import zip_longest
 
 from .config import IGNORED_EMPLOYEE_PATHS
-from .models import ChangeReport, Employee, EmployeeList, FieldChange, ModifiedEmployee
+from .models import (
+    ChangeReport,
+    Employee,
+    EmployeeHashIndex,
+    EmployeeList,
+    FieldChange,
+    ModifiedEmployee,
+)
 
 
-def _get_employee_key(employee: Employee) -> tuple[str, str]:
-    """Extract unique identifier (id, email) from employee."""
-    return (employee.id, employee.email)
+def _build_employee_index(employees: list[Employee]) -> dict[tuple[str, str], Employee]:
+    """Build index of employees by their unique key, (id, email)."""
+    return {(emp.id, emp.email): emp for emp in employees}
+
+
+# Ignored paths split into segments: None marks an ignored subtree
+type _PathTrie = dict[str, _PathTrie | None]
+
+_EMPTY_PATH_TRIE: _PathTrie = {}
+
+
+def _build_path_trie(paths: Iterable[str]) -> _PathTrie:
+    """Build a prefix trie of dotted paths (list items are "[i]" segments)."""
+    trie: _PathTrie = {}
+    for path in paths:
+        *parents, last = path.split(".")
+        node = trie
+        for segment in parents:
+            child = node.setdefault(segment, {})
+            if child is None:  # Already ignored as a whole
+                break
+            node = child
+        else:
+            node[last] = None
+    return trie
+
+
+_IGNORED_EMPLOYEE_TRIE = _build_path_trie(IGNORED_EMPLOYEE_PATHS)
+
+
+def _strip_ignored_paths(obj: object, ignored: _PathTrie) -> object:
+    """Copy obj without the values at ignored paths (same paths as _deep_diff)."""
+    if not ignored:
+        return obj
+    if isinstance(obj, dict):
+        stripped = {}
+        for key, value in obj.items():
+            child = ignored.get(key, _EMPTY_PATH_TRIE)
+            if child is not None:
+                stripped[key] = _strip_ignored_paths(value, child)
+        return stripped
+    if isinstance(obj, list):
+        return [
+            _strip_ignored_paths(item, child)
+            for i, item in enumerate(obj)
+            if (child := ignored.get(f"[{i}]", _EMPTY_PATH_TRIE)) is not None
+        ]
+    return obj
+
+
+def get_employee_content_hash(employee: Employee) -> str:
+    """Hash the employee data that is relevant for change detection.
+
+    The hash is computed once and memoized on the employee.
+    """
+    if employee.content_hash is None:
+        relevant_data = _strip_ignored_paths(employee.raw_data, _IGNORED_EMPLOYEE_TRIE)
+        serialized = json.dumps(
+            relevant_data, sort_keys=True, ensure_ascii=False, default=str
+        )
+        employee.content_hash = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    return employee.content_hash
+
+
+def build_employee_hash_index(employee_list: EmployeeList) -> EmployeeHashIndex:
+    """Build the content hash index of an employee list."""
+    return EmployeeHashIndex(
+        timestamp=employee_list.timestamp,
+        hashes={
+            (emp.id, emp.email): get_employee_content_hash(emp)
+            for emp in employee_list.employees
+        },
+        validators=employee_list.validators,
+    )
 
 
-def _build_employee_index(employees: list[Employee]) -> dict[tuple[str, str], Employee]:
-    """Build index of employees by their unique key."""
-    return {_get_employee_key(emp): emp for emp in employees}
+def has_same_content(current: EmployeeHashIndex, previous: EmployeeHashIndex) -> bool:
+    """Whether two hash indexes describe the same employees with the same data."""
+    return current.hashes == previous.hashes
+
+
+def _differing_values(
+    old: dict[str, object], new: dict[str, object]
+) -> Iterator[tuple[str, object, object]]:
+    """Yield the keys of two dicts whose values differ, with both values.
+
+    A missing key is the same as a None value.
+    """
+    old_keys, new_keys = old.keys(), new.keys()
+    for key in old_keys & new_keys:
+        old_value, new_value = old[key], new[key]
+        if old_value is not new_value and old_value != new_value:
+            yield key, old_value, new_value
+    for key in old_keys - new_keys:
+        if old[key] is not None:
+            yield key, old[key], None
+    for key in new_keys - old_keys:
+        if new[key] is not None:
+            yield key, None, new[key]
 
 
 def _deep_diff(
     old_obj: object,
     new_obj: object,
-    path: str = "",
-    ignored_paths: Container[str] = frozenset(),
+    ignored: _PathTrie = _EMPTY_PATH_TRIE,
 ) -> list[FieldChange]:
-    """Compare two objects recursively and return detailed changes."""
-
-    def extend_path(path: str, extra: str) -> str:
-        """Extend the current path with an additional segment."""
-        return f"{path}.{extra}" if path else extra
+    """Compare two objects and return detailed changes.
 
+    The objects are walked iteratively; paths are kept as tuples of segments and
+    only joined for the changes found. Only values that differ, and whose path
+    isn't ignored, are pushed to the stack, so unchanged and ignored subtrees
+    are skipped as soon as they are reached.
+    """
     changes: list[FieldChange] = []
-
-    if path in ignored_paths or old_obj == new_obj:
+    if old_obj is new_obj or old_obj == new_obj:
         return changes
-
-    if isinstance(old_obj, dict) and isinstance(new_obj, dict):
-        all_keys = set(old_obj.keys()) | set(new_obj.keys())
-        for key in all_keys:
-            changes += _deep_diff(
-                old_obj.get(key),
-                new_obj.get(key),
-                extend_path(path, key),
-                ignored_paths,
+    stack: list[tuple[tuple[str, ...], _PathTrie, object, object]] = [
+        ((), ignored, old_obj, new_obj)
+    ]
+
+    while stack:
+        path, trie, old, new = stack.pop()
+
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key, old_value, new_value in _differing_values(old, new):
+                child = trie.get(key, _EMPTY_PATH_TRIE)
+                if child is not None:
+                    stack.append(((*path, key), child, old_value, new_value))
+
+        elif isinstance(old, list) and isinstance(new, list):
+            # Pushed in reverse so that items are reported in index order
+            items = list(enumerate(zip_longest(old, new)))
+            for i, (item1, item2) in reversed(items):
+                if item1 is item2 or item1 == item2:
+                    continue
+                segment = f"[{i}]"
+                child = trie.get(segment, _EMPTY_PATH_TRIE)
+                if child is not None:
+                    stack.append(((*path, segment), child, item1, item2))
+
+        else:
+            changes.append(
+                FieldChange(field_path=".".join(path), old_value=old, new_value=new)
             )
 
-    elif isinstance(old_obj, list) and isinstance(new_obj, list):
-        for i, (item1, item2) in enumerate(zip_longest(old_obj, new_obj)):
-            changes += _deep_diff(
-                item1, item2, extend_path(path, f"[{i}]"), ignored_paths
-            )
-
-    else:
-        changes.append(
-            FieldChange(
-                field_path=path,
-                old_value=old_obj,
-                new_value=new_obj,
-            )
-        )
-
     return changes
 
 
@@ -69,37 +171,55 @@ def _compare_employee_data(current: Employee, previous: Employee) -> list[FieldC
     return _deep_diff(
         old_obj=previous.raw_data,
         new_obj=current.raw_data,
-        ignored_paths=IGNORED_EMPLOYEE_PATHS,
+        ignored=_IGNORED_EMPLOYEE_TRIE,
     )
 
 
 def compare_employee_lists(
-    current: EmployeeList, previous: EmployeeList
+    current: EmployeeList,
+    previous: EmployeeList,
+    previous_hashes: EmployeeHashIndex | None = None,
 ) -> ChangeReport:
-    """Compare current and previous employee lists to detect changes."""
+    """Compare current and previous employee lists to detect changes.
+
+    When the hash index of the previous list is given (or the previous employees
+    already have their content hash memoized), employees whose content hash
+    didn't change are not compared field by field.
+    """
     current_index = _build_employee_index(current.employees)
     previous_index = _build_employee_index(previous.employees)
 
-    current_keys = set(current_index.keys())
-    previous_keys = set(previous_index.keys())
+    # Key views support set operations directly, no need to copy them into sets
+    current_keys = current_index.keys()
+    previous_keys = previous_index.keys()
 
-    added_employees: list[Employee] = []
-    removed_employees: list[Employee] = []
+    added_employees = [current_index[key] for key in current_keys - previous_keys]
+    removed_employees = [previous_index[key] for key in previous_keys - current_keys]
     modified_employees: list[ModifiedEmployee] = []
 
-    # Find added employees
-    added_employees.extend(current_index[key] for key in current_keys - previous_keys)
-
-    # Find removed employees
-    removed_employees.extend(
-        previous_index[key] for key in previous_keys - current_keys
-    )
-
     # Find modified employees (same key, different data)
     for key in current_keys & previous_keys:
         current_emp = current_index[key]
         previous_emp = previous_index[key]
 
+        # Cheapest check first: shared or equal raw data can't have changes
+        if (
+            current_emp.raw_data is previous_emp.raw_data
+            or current_emp.raw_data == previous_emp.raw_data
+        ):
+            continue
+
+        # Use the previous hash when it is already known, never compute it here
+        previous_hash = (
+            previous_hashes.hashes.get(key)
+            if previous_hashes is not None
+            else previous_emp.content_hash
+        )
+        if previous_hash is not None and previous_hash == get_employee_content_hash(
+            current_emp
+        ):
+            continue
+
         field_changes = _compare_employee_data(current_emp, previous_emp)
 
         if field_changes:  # Only add if there are field changes
@@ -21,6 +21,12 @@ class StdOutOutputInfo(StrEnum):
     NONE = "none"
 
 
+# Choices of the enum-valued options
+_BROWSER_CHOICES = tuple(SupportedBrowser)
+_FORMAT_CHOICES = tuple(OutputFormat)
+_STDOUT_OUTPUT_CHOICES = tuple(StdOutOutputInfo)
+
+
 def show_setup_help() -> None:
     """Show setup instructions."""
     sys.stdout.write("""
@@ -47,6 +53,14 @@ def show_setup_help() -> None:
 """)
 
 
+def is_setup_help_requested(args: list[str] | None = None) -> bool:
+    """Check for --setup-help without building the full argument parser."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--setup-help", action="store_true")
+    known_args, _ = parser.parse_known_args(args)
+    return bool(known_args.setup_help)
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create and configure argument parser."""
     parser = argparse.ArgumentParser(
@@ -76,14 +90,14 @@ Supported browsers: firefox (default), chrome, safari, edge
     parser.add_argument(
         "--browser",
         type=SupportedBrowser,
-        choices=list(SupportedBrowser),
+        choices=_BROWSER_CHOICES,
         default=SupportedBrowser.FIREFOX.value,
         help="Browser to extract cookies from (default: firefox)",
     )
     parser.add_argument(
         "--format",
         type=OutputFormat,
-        choices=list(OutputFormat),
+        choices=_FORMAT_CHOICES,
         default=OutputFormat.TABLE.value,
         help="Employee list output format (default: table)",
     )
@@ -93,12 +107,18 @@ Supported browsers: firefox (default), chrome, safari, edge
     parser.add_argument(
         "--setup-help", action="store_true", help="Show setup instructions"
     )
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Only log warnings and errors to stderr",
+    )
 
     parser.add_argument(
         "--stdout-output",
         "-o",
         type=StdOutOutputInfo,
-        choices=list(StdOutOutputInfo),
+        choices=_STDOUT_OUTPUT_CHOICES,
         default=StdOutOutputInfo.CHANGES.value,
         help="Output information to print to stdout (default: changes)",
     )
@@ -125,4 +145,17 @@ Supported browsers: firefox (default), chrome, safari, edge
         ),
     )
 
+    # Authentication cache options
+    parser.add_argument(
+        "--disable-auth-cache",
+        action="store_true",
+        help="Always extract fresh cookies from the browser",
+    )
+    parser.add_argument(
+        "--auth-cache-file",
+        type=Path,
+        default=default_data_dir / ".auth_cache.json",
+        help=f"Auth cookies cache path (default: {default_data_dir}/.auth_cache.json)",
+    )
+
     return parser
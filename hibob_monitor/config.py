@@ -13,7 +13,7 @@ DEFAULT_HEADERS: dict[str, str] = {
 }
 
 # Authentication-related cookie keywords
-AUTH_KEYWORDS: list[str] = [
+AUTH_KEYWORDS: tuple[str, ...] = (
     "session",
     "auth",
     "token",
@@ -25,33 +25,42 @@ AUTH_KEYWORDS: list[str] = [
     "xsrf",
     "user",
     "account",
-]
+)
 
 # API endpoints to test for authentication
-TEST_ENDPOINTS: list[str] = [
+TEST_ENDPOINTS: tuple[str, ...] = (
     "/api/v1/people",
     "/api/people",
     "/api/v1/employees",
     "/api/employees",
-]
+)
+
+# How long cached authentication cookies are trusted before re-extraction
+AUTH_CACHE_TTL_SECONDS: int = 60 * 60
 
 # API endpoints to try for employee data
-API_ENDPOINTS: list[str] = [
+API_ENDPOINTS: tuple[str, ...] = (
     "/api/employees",
     "/api/v1/employees",
     "/api/people",
     "/api/v1/people",
     "/api/v2/people",
-]
+)
 
-# Possible keys for employee data in API responses
-EMPLOYEE_DATA_KEYS: list[str] = ["employees", "people", "data", "results", "values"]
+# Possible keys for employee data in API responses, in the order they are tried
+EMPLOYEE_DATA_KEYS: tuple[str, ...] = (
+    "employees",
+    "people",
+    "data",
+    "results",
+    "values",
+)
 
 # Fields that identify an employee object
-EMPLOYEE_FIELDS: list[str] = ["id", "email"]
+EMPLOYEE_FIELDS: frozenset[str] = frozenset({"id", "email"})
 
 # Priority fields for table display
-TABLE_DISPLAY_FIELDS: list[str] = [
+TABLE_DISPLAY_FIELDS: tuple[str, ...] = (
     "id",
     "displayName",
     "email",
@@ -60,26 +69,32 @@ TABLE_DISPLAY_FIELDS: list[str] = [
     "work.tenureDurationYears",
     "work.department",
     "work.reportsTo.displayName",
-]
+)
 
 # Default cache configuration
-DEFAULT_CACHE_CONFIG = CacheConfig(max_entries=200, deduplicate_consecutive=True)
+DEFAULT_CACHE_CONFIG = CacheConfig(
+    max_entries=200,
+    deduplicate_consecutive=True,
+    force_refresh_after_seconds=24 * 60 * 60,
+)
 
-IGNORED_EMPLOYEE_PATHS: set[str] = {
-    "work.yearsOfService",
-    "work.durationOfEmployment",
-    "work.tenureDurationYears",
-    "work.tenureDuration",
-    "work.tenureYears",
-    "payroll.timeSinceLastSalaryChange",
-    "avatarUrl",
-    "about.avatar",
-    "work.directReports",
-    "work.indirectReports",
-    "employee.orgLevel",
-    "work.reportsTo.surname",
-    "work.reportsTo.firstName",
-    "work.reportsTo.id",
-    "work.secondLevelManager",
-    "work.manager",
-}
+IGNORED_EMPLOYEE_PATHS: frozenset[str] = frozenset(
+    {
+        "work.yearsOfService",
+        "work.durationOfEmployment",
+        "work.tenureDurationYears",
+        "work.tenureDuration",
+        "work.tenureYears",
+        "payroll.timeSinceLastSalaryChange",
+        "avatarUrl",
+        "about.avatar",
+        "work.directReports",
+        "work.indirectReports",
+        "employee.orgLevel",
+        "work.reportsTo.surname",
+        "work.reportsTo.firstName",
+        "work.reportsTo.id",
+        "work.secondLevelManager",
+        "work.manager",
+    }
+)
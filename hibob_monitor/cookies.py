@@ -3,26 +3,42 @@ Browser cookie extraction functionality
 """
 
 import logging
+import re
 import sys
 from enum import Enum
-from http.cookiejar import Cookie, CookieJar
-from typing import Protocol, assert_never
+from types import ModuleType
+from typing import TYPE_CHECKING, Protocol, assert_never
 
 from .config import AUTH_KEYWORDS
 
+if TYPE_CHECKING:
+    from http.cookiejar import CookieJar
+
 logger = logging.getLogger(__name__)
 
-# Try to import browser_cookie3
-try:
-    import browser_cookie3
+# Matches cookie names containing any of the authentication keywords
+_AUTH_KEYWORDS_RE = re.compile(
+    "|".join(map(re.escape, AUTH_KEYWORDS)), flags=re.IGNORECASE
+)
+
+# Matches any alphanumeric character (a word character other than "_")
+_ALPHANUMERIC_RE = re.compile(r"[^\W_]")
 
-    BROWSER_COOKIE3_AVAILABLE = True
-except ImportError:
-    BROWSER_COOKIE3_AVAILABLE = False
-    logger.error(
-        "❌ browser_cookie3 not installed. Install it with: pip install browser_cookie3"
-    )
-    sys.exit(1)
+
+def _import_browser_cookie3() -> ModuleType:
+    """Import browser_cookie3, only once cookies are actually extracted.
+
+    It is slow to import, and not needed for --help or --setup-help.
+    """
+    try:
+        import browser_cookie3  # noqa: PLC0415
+    except ImportError:
+        logger.error(
+            "❌ browser_cookie3 not installed. "
+            "Install it with: pip install browser_cookie3"
+        )
+        sys.exit(1)
+    return browser_cookie3  # type: ignore[no-any-return]
 
 
 class CookieExtractorCallable(Protocol):
@@ -31,7 +47,7 @@ class CookieExtractorCallable(Protocol):
         cookie_file: str | None = None,
         domain_name: str = "",
         key_file: str | None = None,
-    ) -> CookieJar: ...
+    ) -> "CookieJar": ...
 
 
 class SupportedBrowser(Enum):
@@ -44,6 +60,7 @@ class SupportedBrowser(Enum):
 
     @property
     def get_cookie_jar(self) -> CookieExtractorCallable:
+        browser_cookie3 = _import_browser_cookie3()
         match self:
             case SupportedBrowser.FIREFOX:
                 return browser_cookie3.firefox  # type: ignore[no-any-return]
@@ -58,15 +75,14 @@ class SupportedBrowser(Enum):
 
 
 def _extract_domain_cookies(
-    cookie_jar: CookieJar, domain: str
+    cookie_jar: "CookieJar", domain: str
 ) -> dict[str, str | None]:
     """Extract cookies for specific domain from cookie jar."""
-
-    def is_domain_match(cookie: Cookie) -> bool:
-        return cookie.domain in {domain, f".{domain}"}
-
+    cookie_domains = {domain, f".{domain}"}
     return {
-        cookie.name: cookie.value for cookie in cookie_jar if is_domain_match(cookie)
+        cookie.name: cookie.value
+        for cookie in cookie_jar
+        if cookie.domain in cookie_domains
     }
 
 
@@ -95,13 +111,13 @@ def extract_cookies_from_browser(
 
 def _is_auth_cookie_by_name(name: str) -> bool:
     """Check if cookie name suggests authentication."""
-    return any(keyword in name.lower() for keyword in AUTH_KEYWORDS)
+    return _AUTH_KEYWORDS_RE.search(name) is not None
 
 
 def _is_auth_cookie_by_value(value: str) -> bool:
     """Check if cookie value looks like a session token."""
     min_key_length = 32
-    return len(value) > min_key_length and any(c.isalnum() for c in value)
+    return len(value) > min_key_length and _ALPHANUMERIC_RE.search(value) is not None
 
 
 def filter_auth_cookies(cookies: dict[str, str | None]) -> dict[str, str]:
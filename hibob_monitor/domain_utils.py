@@ -2,12 +2,16 @@
 Domain and URL utilities
 """
 
+from functools import lru_cache
 
+
+@lru_cache(maxsize=16)
 def normalize_domain(domain: str) -> str:
     """Normalize domain by removing protocol prefixes."""
     return domain.replace("https://", "").replace("http://", "")
 
 
+@lru_cache(maxsize=16)
 def build_base_url(domain: str) -> str:
     """Build base URL from domain."""
     return f"https://{normalize_domain(domain)}"
@@ -3,22 +3,21 @@ Employee data extraction and filtering
 """
 
 import logging
-from functools import partial
 
 from .config import (
     API_ENDPOINTS,
     EMPLOYEE_DATA_KEYS,
     EMPLOYEE_FIELDS,
 )
-from .http_utils import make_request
-from .models import EmployeeList
+from .http_utils import make_conditional_request
+from .models import EmployeeList, NotModified, ResponseValidators
 
 logger = logging.getLogger(__name__)
 
 
 def _is_employee_object(data: object) -> bool:
     """Check if data looks like an employee object."""
-    return isinstance(data, dict) and all(field in data for field in EMPLOYEE_FIELDS)
+    return isinstance(data, dict) and data.keys() >= EMPLOYEE_FIELDS
 
 
 def _extract_employees_from_response(data: object) -> list[dict[str, object]]:
@@ -28,8 +27,9 @@ def _extract_employees_from_response(data: object) -> list[dict[str, object]]:
     if isinstance(data, dict):
         # Try known keys for employee arrays
         for key in EMPLOYEE_DATA_KEYS:
-            if key in data and isinstance(data[key], list):
-                return data[key]  # type: ignore[no-any-return]
+            employees = data.get(key)
+            if isinstance(employees, list):
+                return employees
 
         # Single employee object
         if _is_employee_object(data):
@@ -48,29 +48,37 @@ def _filter_active_employees(
     employees: list[dict[str, object]],
 ) -> list[dict[str, object]]:
     """Filter employees to only include active ones."""
-    active_employees = [emp for emp in employees if _is_employee_active(emp)]
-
-    # Log inactive employees for debugging
-    inactive_employees = [emp for emp in employees if not _is_employee_active(emp)]
-    for emp in inactive_employees:
-        logger.warning(
-            "⚠️  Employee %s is not active (status: %s)",
-            emp.get("id", "unknown"),
-            emp.get("status"),
-        )
+    active_employees = []
+    for emp in employees:
+        if _is_employee_active(emp):
+            active_employees.append(emp)
+        else:
+            # Log inactive employees for debugging
+            logger.warning(
+                "⚠️  Employee %s is not active (status: %s)",
+                emp.get("id", "unknown"),
+                emp.get("status"),
+            )
 
     return active_employees
 
 
 def _try_endpoint(
-    base_url: str, endpoint: str, cookies: dict[str, str]
-) -> EmployeeList | None:
+    base_url: str,
+    endpoint: str,
+    cookies: dict[str, str],
+    validators: ResponseValidators | None = None,
+) -> EmployeeList | NotModified | None:
     """Try to fetch employees from a specific endpoint."""
     url = f"{base_url}{endpoint}"
     logger.info("🔍 Trying endpoint: %s", endpoint)
 
-    data = make_request(url, cookies)
+    response = make_conditional_request(url, cookies, validators)
+    if response.not_modified and validators is not None:
+        logger.info("✅ Employee data not modified since last run")
+        return NotModified(validators)
 
+    data = response.data
     if data is not None:
         employees_data = _extract_employees_from_response(data)
 
@@ -79,6 +87,7 @@ def _try_endpoint(
 
             if active_employees_data:
                 employee_list = EmployeeList.from_raw_data(active_employees_data)
+                employee_list.validators = response.validators
                 logger.info("✅ Found %s active employees", employee_list.count)
                 return employee_list
             logger.warning(
@@ -88,15 +97,32 @@ def _try_endpoint(
     return None
 
 
-def get_active_employees(base_url: str, cookies: dict[str, str]) -> EmployeeList | None:
-    """Fetch list of active employees by trying multiple endpoints."""
-    endpoint_functions = [
-        partial(_try_endpoint, base_url, endpoint, cookies)
-        for endpoint in API_ENDPOINTS
-    ]
-
-    for endpoint_func in endpoint_functions:
-        result = endpoint_func()
+def get_active_employees(
+    base_url: str,
+    cookies: dict[str, str],
+    validators: ResponseValidators | None = None,
+) -> EmployeeList | NotModified | None:
+    """Fetch list of active employees by trying multiple endpoints.
+
+    If the validators of a previous response are given, its endpoint is tried
+    first with a conditional request, and NotModified is returned if the server
+    reports it unchanged. The endpoints are tried one at a time: each attempt
+    downloads the whole employee list.
+    """
+    tried_endpoint = None
+    if validators is not None:
+        for endpoint in API_ENDPOINTS:
+            if f"{base_url}{endpoint}" == validators.url:
+                result = _try_endpoint(base_url, endpoint, cookies, validators)
+                if result is not None:
+                    return result
+                tried_endpoint = endpoint
+                break
+
+    for endpoint in API_ENDPOINTS:
+        if endpoint == tried_endpoint:
+            continue  # It just failed, no need to download it again
+        result = _try_endpoint(base_url, endpoint, cookies)
         if result is not None:
             return result
 
@@ -0,0 +1,40 @@
+"""
+File system utilities
+"""
+
+import os
+from pathlib import Path
+
+# Directories already created (or found to exist) by this process
+_ensured_directories: set[Path] = set()
+
+
+def ensure_parent_directory(path: Path) -> None:
+    """Create the parent directory of path if needed, once per process."""
+    directory = path.parent
+    if directory not in _ensured_directories:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ensured_directories.add(directory)
+
+
+def write_atomically(
+    path: Path, content: bytes, *, durable: bool = False, mode: int = 0o666
+) -> None:
+    """Write content to path in one go, replacing the file atomically.
+
+    Readers (or a crash) never see a half-written file. The data is only
+    fsync'ed to disk if durable is set. A new file is created with mode (minus
+    the umask).
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        tmp_path.replace(path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
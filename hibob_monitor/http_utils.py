@@ -2,54 +2,288 @@
 HTTP request utilities
 """
 
+import atexit
+import base64
+import http.client
 import json
-import urllib.error
+import threading
+import urllib.parse
 import urllib.request
+from dataclasses import dataclass
+from email.message import Message
 from http import HTTPStatus
 from typing import Any
 
 from .config import DEFAULT_HEADERS
+from .models import ResponseValidators
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Redirects are followed like urlopen does, up to as many times
+MAX_REDIRECTS = 10
+_REDIRECT_STATUSES = frozenset(
+    {
+        HTTPStatus.MOVED_PERMANENTLY,
+        HTTPStatus.FOUND,
+        HTTPStatus.SEE_OTHER,
+        HTTPStatus.TEMPORARY_REDIRECT,
+        HTTPStatus.PERMANENT_REDIRECT,
+    }
+)
+
+# Errors from a reused connection that mean the server closed it while idle
+_CLOSED_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+# Scheme, host and port of the server, and URL of the proxy to reach it through
+type _ConnectionKey = tuple[str, str, int | None, str | None]
+
+# Idle keep-alive connections, reused by later requests to the same host
+_idle_connections: dict[_ConnectionKey, list[http.client.HTTPConnection]] = {}
+_idle_connections_lock = threading.Lock()
+
+
+@dataclass
+class ConditionalResponse:
+    """Outcome of a conditional request."""
+
+    data: dict[str, Any] | None = None
+    validators: ResponseValidators | None = None
+    not_modified: bool = False
+
+
+def _get_proxy(scheme: str, host: str) -> str | None:
+    """Get the proxy URL for scheme and host from the environment, like urlopen."""
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    # Proxies are commonly given as just "host:port"
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def _get_proxy_auth_headers(proxy: str) -> dict[str, str]:
+    """Build the Proxy-Authorization header for the credentials in a proxy URL."""
+    parts = urllib.parse.urlsplit(proxy)
+    if parts.username is None:
+        return {}
+    credentials = urllib.parse.unquote(parts.username)
+    if parts.password is not None:
+        credentials = f"{credentials}:{urllib.parse.unquote(parts.password)}"
+    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
 
 
 def _create_request(
     url: str,
     headers: dict[str, str] | None = None,
     cookies: dict[str, str] | None = None,
-) -> urllib.request.Request:
-    """Create HTTP request with headers and cookies."""
-    if not url.startswith(("http:", "https:")):
+) -> tuple[_ConnectionKey, str, dict[str, str]]:
+    """Create HTTP request (connection key, target and headers) with cookies.
+
+    Proxies configured in the environment (e.g. HTTPS_PROXY) are honored.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
         msg = "URL must start with 'http:' or 'https:'"
         raise ValueError(msg)
 
-    req = urllib.request.Request(url, headers=headers or DEFAULT_HEADERS)  # noqa: S310
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
 
+    request_headers = dict(headers or DEFAULT_HEADERS)
     if cookies:
-        cookie_header = "; ".join(
+        request_headers["Cookie"] = "; ".join(
             [f"{name}={value}" for name, value in cookies.items()]
         )
-        req.add_header("Cookie", cookie_header)
 
-    return req
+    proxy = _get_proxy(parts.scheme, parts.hostname)
+    if proxy is not None and parts.scheme == "http":
+        # Plain HTTP goes through the proxy as is, HTTPS is tunneled instead
+        target = f"http://{parts.netloc}{target}"
+        request_headers |= _get_proxy_auth_headers(proxy)
+
+    return (parts.scheme, parts.hostname, parts.port, proxy), target, request_headers
+
+
+def _new_connection(key: _ConnectionKey) -> http.client.HTTPConnection:
+    """Open a new connection for the given connection key."""
+    scheme, host, port, proxy = key
+    connection_class = (
+        http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    )
+    if proxy is None:
+        return connection_class(host, port, timeout=REQUEST_TIMEOUT_SECONDS)
+
+    proxy_parts = urllib.parse.urlsplit(proxy)
+    default_proxy_port = 443 if proxy_parts.scheme == "https" else 80
+    connection = connection_class(
+        proxy_parts.hostname or "",
+        proxy_parts.port or default_proxy_port,
+        timeout=REQUEST_TIMEOUT_SECONDS,
+    )
+    if scheme == "https":
+        connection.set_tunnel(host, port, headers=_get_proxy_auth_headers(proxy))
+    return connection
+
+
+def _acquire_idle_connection(
+    key: _ConnectionKey,
+) -> http.client.HTTPConnection | None:
+    """Take an idle connection to the given host out of the pool, if any."""
+    with _idle_connections_lock:
+        idle = _idle_connections.get(key)
+        return idle.pop() if idle else None
+
+
+def _release_connection(
+    key: _ConnectionKey, connection: http.client.HTTPConnection
+) -> None:
+    """Return a connection to the pool to be reused."""
+    with _idle_connections_lock:
+        _idle_connections.setdefault(key, []).append(connection)
+
+
+@atexit.register
+def _close_idle_connections() -> None:
+    """Close all the idle connections of the pool."""
+    with _idle_connections_lock:
+        for connections in _idle_connections.values():
+            for connection in connections:
+                connection.close()
+        _idle_connections.clear()
+
+
+def _send(
+    key: _ConnectionKey,
+    connection: http.client.HTTPConnection,
+    target: str,
+    headers: dict[str, str],
+) -> tuple[int, Message, bytes]:
+    """Send a GET request and read the whole response."""
+    connection.request("GET", target, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+
+    if response.will_close:
+        connection.close()
+    else:
+        _release_connection(key, connection)
+    return response.status, response.headers, body
+
+
+def _get(
+    key: _ConnectionKey, target: str, headers: dict[str, str]
+) -> tuple[int, Message, bytes]:
+    """GET target, reusing an idle keep-alive connection when possible."""
+    connection = _acquire_idle_connection(key)
+    if connection is not None:
+        try:
+            return _send(key, connection, target, headers)
+        except _CLOSED_CONNECTION_ERRORS:
+            # The server dropped the idle connection: retry on a new one
+            connection.close()
+        except BaseException:
+            # Anything else, e.g. a timeout, would just happen again
+            connection.close()
+            raise
+
+    connection = _new_connection(key)
+    try:
+        return _send(key, connection, target, headers)
+    except BaseException:
+        connection.close()
+        raise
+
+
+def warm_up_connection(url: str) -> None:
+    """Open a connection to the host of url ahead of time, for later requests."""
+    try:
+        key, _, _ = _create_request(url)
+        connection = _new_connection(key)
+        connection.connect()
+    except (OSError, ValueError):
+        # Nothing to reuse then, the actual request will report the failure
+        return
+    _release_connection(key, connection)
+
+
+def _get_conditional_headers(validators: ResponseValidators | None) -> dict[str, str]:
+    """Build the conditional request headers for the given validators."""
+    if validators is None:
+        return {}
+
+    headers = {}
+    if validators.etag:
+        headers["If-None-Match"] = validators.etag
+    if validators.last_modified:
+        headers["If-Modified-Since"] = validators.last_modified
+    return headers
+
+
+def _get_following_redirects(
+    url: str, headers: dict[str, str], cookies: dict[str, str] | None
+) -> tuple[int, Message, bytes]:
+    """GET url, following redirects like urlopen.
+
+    The cookies are only sent to the host of url, not to other hosts it may
+    redirect to.
+    """
+    request_url = url
+    for _ in range(MAX_REDIRECTS + 1):
+        key, target, request_headers = _create_request(request_url, headers, cookies)
+        status, response_headers, body = _get(key, target, request_headers)
+        location = response_headers.get("Location")
+        if status not in _REDIRECT_STATUSES or location is None:
+            return status, response_headers, body
+
+        next_url = urllib.parse.urljoin(request_url, location)
+        if urllib.parse.urlsplit(next_url).hostname != key[1]:
+            cookies = None
+        request_url = next_url
+
+    msg = f"Too many redirects from {url}"
+    raise http.client.HTTPException(msg)
+
+
+def make_conditional_request(
+    url: str,
+    cookies: dict[str, str] | None = None,
+    validators: ResponseValidators | None = None,
+) -> ConditionalResponse:
+    """Make authenticated request to API, conditional on the given validators.
+
+    If the server answers 304 Not Modified, the response is flagged as such and
+    has no data.
+    """
+    try:
+        status, response_headers, body = _get_following_redirects(
+            url, DEFAULT_HEADERS | _get_conditional_headers(validators), cookies
+        )
+
+        if status == HTTPStatus.OK:
+            data: dict[str, Any] = json.loads(body)
+            return ConditionalResponse(
+                data=data,
+                validators=ResponseValidators(
+                    url=url,
+                    etag=response_headers.get("ETag"),
+                    last_modified=response_headers.get("Last-Modified"),
+                ),
+            )
+        if status == HTTPStatus.NOT_MODIFIED:
+            return ConditionalResponse(validators=validators, not_modified=True)
+        return ConditionalResponse()
+
+    except Exception:  # noqa: BLE001
+        return ConditionalResponse()
 
 
 def make_request(
     url: str, cookies: dict[str, str] | None = None
 ) -> dict[str, Any] | None:
     """Make authenticated request to API."""
-    try:
-        req = _create_request(url, DEFAULT_HEADERS, cookies)
-
-        with urllib.request.urlopen(req, timeout=30) as response:  # noqa: S310
-            if response.status == HTTPStatus.OK:
-                result: dict[str, Any] = json.loads(response.read().decode("utf-8"))
-                return result
-            return None
-
-    except urllib.error.HTTPError as e:
-        if (
-            e.code != HTTPStatus.UNAUTHORIZED
-        ):  # Don't log 401 errors, they're expected during testing
-            pass
-        return None
-    except Exception:  # noqa: BLE001
-        return None
+    return make_conditional_request(url, cookies).data
@@ -2,12 +2,36 @@
 Data models for HiBob employee monitoring
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any, Self
 
 
-@dataclass
+def _intern_strings(data: dict[str, Any] | list[Any]) -> None:
+    """Intern the string values of parsed JSON data in place.
+
+    Values like departments or sites repeat across employees and snapshots:
+    interned, they share storage and compare equal by identity.
+    """
+    stack = [data]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            for key, value in container.items():
+                if isinstance(value, str):
+                    container[key] = sys.intern(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        else:
+            for i, value in enumerate(container):
+                if isinstance(value, str):
+                    container[i] = sys.intern(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+
+
+@dataclass(slots=True)
 class EmployeeDescription:
     id: str
     email: str
@@ -17,23 +41,32 @@ class EmployeeDescription:
     site: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Employee(EmployeeDescription):
     """Structured employee data with normalized fields."""
 
     raw_data: dict[str, Any]
+    # Memoized by change_detection.get_employee_content_hash
+    content_hash: str | None = field(default=None, init=False, repr=False)
 
     @classmethod
     def from_raw_data(cls, raw_data: dict[str, Any]) -> "Employee":
         """Create Employee from raw API response data."""
+        _intern_strings(raw_data)
+
         # Extract normalized fields
         emp_id = str(raw_data.get("id", ""))
 
+        work = raw_data.get("work")
+        if not isinstance(work, dict):
+            work = {}
+
         # Try different email field locations
         email = (
-            raw_data.get("email", "") or raw_data.get("work", {}).get("email", "")
-            if isinstance(raw_data.get("work"), dict)
-            else "" or raw_data.get("personalEmail", "") or ""
+            raw_data.get("email")
+            or work.get("email")
+            or raw_data.get("personalEmail")
+            or ""
         )
 
         # Try different name field locations
@@ -48,9 +81,9 @@ class Employee(EmployeeDescription):
         # Extract status
         status = str(raw_data.get("status", "active")).lower()
 
-        department = str(raw_data.get("work", {}).get("department", "")).strip()
+        department = str(work.get("department", "")).strip()
 
-        site = str(raw_data.get("work", {}).get("site", "")).strip()
+        site = str(work.get("site", "")).strip()
 
         return cls(
             id=emp_id,
@@ -66,20 +99,56 @@ class Employee(EmployeeDescription):
         """Compare employees based on raw data for change detection."""
         if not isinstance(other, Employee):
             return False
-        return self.raw_data == other.raw_data
+        # Shared raw data (e.g. the same cached snapshot) is equal without a walk
+        return self.raw_data is other.raw_data or self.raw_data == other.raw_data
 
     def __hash__(self) -> int:
         """Hash based on id and email for set operations."""
         return hash((self.id, self.email))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class ResponseValidators:
+    """HTTP cache validators of the response some data was fetched from."""
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ResponseValidators":
+        """Create from dictionary (for cache loading)."""
+        return cls(
+            url=data["url"],
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+        )
+
+
+@dataclass(slots=True)
+class NotModified:
+    """The server reported the data as unchanged since it was last fetched."""
+
+    validators: ResponseValidators
+
+
+@dataclass(slots=True)
 class EmployeeList:
     """Container for employee data with metadata."""
 
     timestamp: datetime
     count: int
     employees: list[Employee] = field(default_factory=list)
+    # Validators of the API response the list was built from, if known
+    validators: ResponseValidators | None = None
 
     @classmethod
     def from_raw_data(cls, employees_data: list[dict[str, Any]]) -> "EmployeeList":
@@ -91,6 +160,10 @@ class EmployeeList:
             employees=employees,
         )
 
+    def __bool__(self) -> bool:
+        """Whether the list has any employees (from the stored count)."""
+        return self.count > 0
+
     def __eq__(self, other: object) -> bool:
         """Compare EmployeeLists based on employee data (ignoring timestamp)."""
         if not isinstance(other, EmployeeList):
@@ -122,7 +195,44 @@ class EmployeeList:
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class EmployeeHashIndex:
+    """Content hashes of an EmployeeList's employees, keyed by (id, email)."""
+
+    timestamp: datetime
+    hashes: dict[tuple[str, str], str] = field(default_factory=dict)
+    validators: ResponseValidators | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "validators": self.validators.to_dict() if self.validators else None,
+            "employees": [
+                [emp_id, email, content_hash]
+                for (emp_id, email), content_hash in self.hashes.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EmployeeHashIndex":
+        """Create from dictionary (for cache loading)."""
+        validators_data = data.get("validators")
+        return cls(
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            hashes={
+                (emp_id, email): content_hash
+                for emp_id, email, content_hash in data.get("employees", [])
+            },
+            validators=(
+                ResponseValidators.from_dict(validators_data)
+                if validators_data
+                else None
+            ),
+        )
+
+
+@dataclass(slots=True)
 class FieldChange:
     """Represents a change in a specific field."""
 
@@ -134,7 +244,7 @@ class FieldChange:
         return f"{self.field_path}: {self.old_value} → {self.new_value}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModifiedEmployee(EmployeeDescription):
     """Represents an employee with field changes."""
 
@@ -156,7 +266,7 @@ class ModifiedEmployee(EmployeeDescription):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ChangeReport:
     """Report of changes between two EmployeeLists."""
 
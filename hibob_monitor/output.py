@@ -6,11 +6,13 @@ import csv
 import io
 import json
 import logging
+import sys
 from enum import Enum
 from pathlib import Path
 from typing import Any, assert_never
 
 from .config import TABLE_DISPLAY_FIELDS
+from .file_utils import ensure_parent_directory
 from .models import ChangeReport, EmployeeDescription, EmployeeList
 
 logger = logging.getLogger(__name__)
@@ -38,36 +40,66 @@ class OutputFormat(Enum):
 
 def _get_table_display_fields(flat_employee_data: list[dict[str, Any]]) -> list[str]:
     """Determine which fields to display in table."""
-    if not flat_employee_data:
-        return []
-
-    all_fields = {field for emp in flat_employee_data for field in emp}
-
-    return [f for f in TABLE_DISPLAY_FIELDS if f in all_fields]
+    # Only the few display fields are looked up, usually in the first employee,
+    # instead of collecting every field of every employee
+    return [
+        f
+        for f in TABLE_DISPLAY_FIELDS
+        if any(f in flat_emp for flat_emp in flat_employee_data)
+    ]
 
 
 def _flatten_dict(
     data: dict[str, Any],
 ) -> dict[str, Any]:
-    """Flatten a nested dict (of dicts and lists) to a single level dict."""
-
-    def _flatten_recursive(data: Any, path: str = "") -> dict[str, Any]:  # noqa: ANN401
-        """Recursive helper to flatten dict."""
-        if isinstance(data, dict):
-            result = {}
-            for key, value in data.items():
-                new_key = f"{path}.{key}" if path else key
-                result.update(_flatten_recursive(value, new_key))
-            return result
-        if isinstance(data, list):
-            result = {}
-            for i, item in enumerate(data):
-                new_key = f"{path}.[{i}]" if path else f"[{i}]"
-                result.update(_flatten_recursive(item, new_key))
-            return result
-        return {path: data}
-
-    return _flatten_recursive(data)
+    """Flatten a nested dict (of dicts and lists) to a single level dict.
+
+    The data is walked iteratively, writing the leaves straight into the result.
+    """
+    result: dict[str, Any] = {}
+    stack: list[tuple[str, Any]] = [("", data)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict):
+            # Pushed in reverse so that fields keep their order
+            stack.extend(
+                (f"{path}.{key}" if path else key, item)
+                for key, item in reversed(value.items())
+            )
+        elif isinstance(value, list):
+            stack.extend(
+                (f"{path}.[{i}]" if path else f"[{i}]", item)
+                for i, item in reversed(list(enumerate(value)))
+            )
+        else:
+            # Interned, all employees' flattened data share the same key strings
+            result[sys.intern(path)] = value
+    return result
+
+
+_MISSING = object()
+
+# Table display fields, with their path split into segments
+_TABLE_DISPLAY_PATHS = tuple(
+    (field, field.split(".")) for field in TABLE_DISPLAY_FIELDS
+)
+
+
+def _get_flat_field(data: dict[str, Any], path: list[str]) -> object:
+    """Get the leaf value _flatten_dict would give for path, or _MISSING."""
+    value: object = data
+    for segment in path:
+        if isinstance(value, dict):
+            value = value.get(segment, _MISSING)
+        elif isinstance(value, list):
+            index = segment[1:-1]
+            if not (segment.startswith("[") and index.isdigit()):
+                return _MISSING
+            value = value[int(index)] if int(index) < len(value) else _MISSING
+        else:
+            return _MISSING
+    # Containers aren't leaves, _flatten_dict would only give their items
+    return _MISSING if isinstance(value, (dict, list)) else value
 
 
 def format_employees_as_table(
@@ -77,29 +109,36 @@ def format_employees_as_table(
     if not employee_list.employees:
         return "No employees found."
 
-    # Get all employee data as flatten dicts
+    # Only extract the displayable fields, instead of flattening all the data
     flattened_employee_data = [
-        _flatten_dict(emp.raw_data) for emp in employee_list.employees
+        {
+            field: value
+            for field, path in _TABLE_DISPLAY_PATHS
+            if (value := _get_flat_field(emp.raw_data, path)) is not _MISSING
+        }
+        for emp in employee_list.employees
     ]
 
     fields = _get_table_display_fields(flattened_employee_data)
     if not fields:
         return "No data to display."
 
-    col_widths = [max(len(field), max_col_width) for field in fields]
+    # Columns are max_col_width wide, or wider to fit their whole header; values
+    # longer than that are truncated
+    columns = [(field, max(len(field), max_col_width)) for field in fields]
 
     # Create table header
-    header = " | ".join(f"{field:<{col_widths[i]}}" for i, field in enumerate(fields))
+    header = " | ".join(field.ljust(width) for field, width in columns)
     separator = "-" * len(header)
 
-    # Create table rows
-    rows = []
-    for flat_emp in flattened_employee_data:
-        row_values = []
-        for i, field in enumerate(fields):
-            value = str(flat_emp.get(field, ""))[: col_widths[i]]
-            row_values.append(f"{value:<{col_widths[i]}}")
-        rows.append(" | ".join(row_values))
+    # Create table rows (str.ljust is cheaper than a per cell format spec)
+    rows = [
+        " | ".join(
+            str(flat_emp.get(field, ""))[:width].ljust(width)
+            for field, width in columns
+        )
+        for flat_emp in flattened_employee_data
+    ]
 
     # Combine all parts
     table_parts = [header, separator, *rows]
@@ -121,16 +160,18 @@ def format_employees_as_csv(employee_list: EmployeeList) -> str:
         _flatten_dict(emp.raw_data) for emp in employee_list.employees
     ]
 
-    # Get all possible fields from all employees
-    all_fields = sorted({field for emp in flattened_employee_data for field in emp})
+    # Get all possible fields from all employees (the union of their keys)
+    all_fields = sorted(set().union(*flattened_employee_data))
 
     # Create CSV output
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=all_fields)
-    writer.writeheader()
-
-    for emp in flattened_employee_data:
-        writer.writerow(emp)
+    writer = csv.writer(output)
+    writer.writerow(all_fields)
+    # Plain rows skip DictWriter's per row key checks and dict to list conversion
+    writer.writerows(
+        [flat_emp.get(field, "") for field in all_fields]
+        for flat_emp in flattened_employee_data
+    )
 
     return output.getvalue()
 
@@ -185,19 +226,20 @@ def format_change_report_as_text(change_report: ChangeReport) -> str:
         f" {len(change_report.removed)} removed, "
         f"{len(change_report.modified)} modified"
     )
+    # Trailing blank line, joined in rather than concatenated to the full text
+    lines.extend(("", ""))
 
-    return "\n".join(lines) + "\n\n"
+    return "\n".join(lines)
 
 
 def write_to_file(content: str, filepath: Path) -> bool:
     """Write content to a file, creating directory if needed."""
     try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+        ensure_parent_directory(filepath)
         with filepath.open("w", encoding="utf-8") as f:
             f.write(content)
     except OSError as e:
-        msg = f"Error writing to {filepath}: {e}"
-        logger.error(msg)
+        logger.error("Error writing to %s: %s", filepath, e)
         return False
     else:
         return True
@@ -206,12 +248,11 @@ def write_to_file(content: str, filepath: Path) -> bool:
 def append_to_file(content: str, filepath: Path) -> bool:
     """Append content to a file, creating directory if needed."""
     try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+        ensure_parent_directory(filepath)
         with filepath.open("a", encoding="utf-8") as f:
             f.write(content)
     except OSError as e:
-        msg = f"Error appending to {filepath}: {e}"
-        logger.error(msg)
+        logger.error("Error appending to %s: %s", filepath, e)
         return False
     else:
         return True
@@ -0,0 +1,178 @@
+import json
+import logging
+import time
+from pathlib import Path
+
+import pytest
+
+from hibob_monitor import auth
+from hibob_monitor.config import AUTH_CACHE_TTL_SECONDS, TEST_ENDPOINTS
+from hibob_monitor.cookies import SupportedBrowser
+
+BASE_URL = "https://acme.hibob.com"
+
+
+def stub_make_request(
+    monkeypatch: pytest.MonkeyPatch,
+    working_endpoints: set[str],
+    valid_cookies: dict[str, str] | None = None,
+) -> list[str]:
+    """Stub make_request to only succeed on working_endpoints, recording URLs."""
+    requested: list[str] = []
+
+    def make_request(
+        url: str, cookies: dict[str, str] | None = None
+    ) -> dict[str, object] | None:
+        requested.append(url)
+        endpoint = url.removeprefix(BASE_URL)
+        if cookies != (valid_cookies or {"session": "abc"}):
+            return None
+        return {"employees": []} if endpoint in working_endpoints else None
+
+    monkeypatch.setattr(auth, "make_request", make_request)
+    return requested
+
+
+def test_authenticate_returns_first_working_endpoint(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    requested = stub_make_request(monkeypatch, {TEST_ENDPOINTS[1], TEST_ENDPOINTS[2]})
+    endpoint = auth._authenticate(BASE_URL, {"session": "abc"})  # noqa: SLF001
+    assert endpoint == TEST_ENDPOINTS[1]
+    # Stops at the first working endpoint
+    assert requested == [f"{BASE_URL}{e}" for e in TEST_ENDPOINTS[:2]]
+
+
+def test_authenticate_fails_on_all_endpoints(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    requested = stub_make_request(monkeypatch, set())
+    assert auth._authenticate(BASE_URL, {"session": "abc"}) is None  # noqa: SLF001
+    assert requested == [f"{BASE_URL}{endpoint}" for endpoint in TEST_ENDPOINTS]
+
+
+def test_authenticate_tries_preferred_endpoint_first(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    preferred = TEST_ENDPOINTS[-1]
+    requested = stub_make_request(monkeypatch, set(TEST_ENDPOINTS))
+    endpoint = auth._authenticate(BASE_URL, {"session": "abc"}, preferred)  # noqa: SLF001
+    assert endpoint == preferred
+    assert requested == [f"{BASE_URL}{preferred}"]
+
+
+def test_authenticate_falls_back_from_preferred_endpoint(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    preferred = TEST_ENDPOINTS[0]
+    requested = stub_make_request(monkeypatch, {TEST_ENDPOINTS[2]})
+    endpoint = auth._authenticate(BASE_URL, {"session": "abc"}, preferred)  # noqa: SLF001
+    assert endpoint == TEST_ENDPOINTS[2]
+    assert requested == [f"{BASE_URL}{e}" for e in TEST_ENDPOINTS[:3]]
+
+
+def test_get_fresh_cookies() -> None:
+    fresh = {"cookies": {"session": "abc"}, "expires_at": time.time() + 60}
+    assert auth._get_fresh_cookies(fresh) == {"session": "abc"}  # noqa: SLF001
+
+    expired = {"cookies": {"session": "abc"}, "expires_at": time.time() - 1}
+    assert auth._get_fresh_cookies(expired) is None  # noqa: SLF001
+    assert auth._get_fresh_cookies({"cookies": {"session": "abc"}}) is None  # noqa: SLF001
+    assert auth._get_fresh_cookies({"expires_at": time.time() + 60}) is None  # noqa: SLF001
+
+
+def test_save_auth_cache_entry(tmp_path: Path) -> None:
+    auth_cache_file = tmp_path / "data" / ".auth_cache.json"
+    auth_cache_file.parent.mkdir()
+    auth_cache_file.write_text(json.dumps({"chrome:other.hibob.com": {}}))
+
+    before = time.time()
+    auth._save_auth_cache_entry(  # noqa: SLF001
+        auth_cache_file, "firefox:acme.hibob.com", {"session": "abc"}, "/api/people"
+    )
+
+    auth_cache = json.loads(auth_cache_file.read_text())
+    assert auth_cache["chrome:other.hibob.com"] == {}
+    entry = auth_cache["firefox:acme.hibob.com"]
+    assert entry["cookies"] == {"session": "abc"}
+    assert entry["endpoint"] == "/api/people"
+    assert before + AUTH_CACHE_TTL_SECONDS <= entry["expires_at"]
+    assert entry["expires_at"] <= time.time() + AUTH_CACHE_TTL_SECONDS
+    assert auth_cache_file.stat().st_mode & 0o777 == 0o600  # noqa: PLR2004
+
+
+def write_auth_cache(auth_cache_file: Path, cookies: dict[str, str]) -> None:
+    auth._save_auth_cache_entry(  # noqa: SLF001
+        auth_cache_file, "firefox:acme.hibob.com", cookies, TEST_ENDPOINTS[0]
+    )
+
+
+def stub_browser(
+    monkeypatch: pytest.MonkeyPatch, cookies: dict[str, str]
+) -> list[SupportedBrowser]:
+    """Stub the browser cookie extraction, recording the browsers read."""
+    extractions: list[SupportedBrowser] = []
+
+    def extract_cookies_from_browser(
+        browser: SupportedBrowser, domain: str
+    ) -> dict[str, str]:
+        assert domain == "acme.hibob.com"
+        extractions.append(browser)
+        return cookies
+
+    monkeypatch.setattr(
+        auth, "extract_cookies_from_browser", extract_cookies_from_browser
+    )
+    monkeypatch.setattr(auth, "warm_up_connection", lambda _: None)
+    return extractions
+
+
+def test_authenticate_reuses_cached_cookies(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    auth_cache_file = tmp_path / ".auth_cache.json"
+    write_auth_cache(auth_cache_file, {"session": "abc"})
+    requested = stub_make_request(monkeypatch, set(TEST_ENDPOINTS))
+    extractions = stub_browser(monkeypatch, {})
+
+    assert auth.authenticate_with_browser(
+        "acme.hibob.com", SupportedBrowser.FIREFOX, auth_cache_file
+    ) == (True, {"session": "abc"})
+    assert not extractions
+    assert requested == [f"{BASE_URL}{TEST_ENDPOINTS[0]}"]
+
+
+def test_authenticate_falls_back_to_browser_cookies(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    auth_cache_file = tmp_path / ".auth_cache.json"
+    write_auth_cache(auth_cache_file, {"session": "expired"})
+    stub_make_request(monkeypatch, set(TEST_ENDPOINTS), {"session": "fresh"})
+    extractions = stub_browser(monkeypatch, {"session": "fresh", "theme": "dark"})
+
+    with caplog.at_level(logging.INFO):
+        assert auth.authenticate_with_browser(
+            "acme.hibob.com", SupportedBrowser.FIREFOX, auth_cache_file
+        ) == (True, {"session": "fresh"})
+    assert extractions == [SupportedBrowser.FIREFOX]
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+
+    entry = json.loads(auth_cache_file.read_text())["firefox:acme.hibob.com"]
+    assert entry["cookies"] == {"session": "fresh"}
+
+
+@pytest.mark.parametrize("entry", [[], "abc", None, 1])
+def test_authenticate_ignores_corrupt_cache_entry(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, entry: object
+) -> None:
+    auth_cache_file = tmp_path / ".auth_cache.json"
+    auth_cache_file.write_text(json.dumps({"firefox:acme.hibob.com": entry}))
+    stub_make_request(monkeypatch, set(TEST_ENDPOINTS))
+    extractions = stub_browser(monkeypatch, {"session": "abc"})
+
+    assert auth.authenticate_with_browser(
+        "acme.hibob.com", SupportedBrowser.FIREFOX, auth_cache_file
+    ) == (True, {"session": "abc"})
+    assert extractions == [SupportedBrowser.FIREFOX]
@@ -0,0 +1,158 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from hibob_monitor.cache import (
+    CacheConfig,
+    CacheStore,
+    get_cache_index_file,
+    get_latest_cache,
+    get_latest_cache_index,
+    is_cache_recent,
+    load_cache,
+    save_cache,
+)
+from hibob_monitor.change_detection import build_employee_hash_index
+from hibob_monitor.models import EmployeeList
+
+
+def make_employee_list(department: str) -> EmployeeList:
+    return EmployeeList.from_raw_data(
+        [
+            {
+                "id": "1",
+                "email": "a@x.com",
+                "fullName": "A",
+                "work": {"department": department},
+            }
+        ]
+    )
+
+
+def test_save_and_load_latest(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    save_cache(make_employee_list("HR"), cache_file)
+    save_cache(make_employee_list("IT"), cache_file, CacheConfig(durable=True))
+
+    latest = get_latest_cache(cache_file)
+    assert latest == make_employee_list("IT")
+    assert not cache_file.with_name("cache.json.tmp").exists()
+
+
+def test_save_hash_index(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    employee_list = make_employee_list("HR")
+    hash_index = build_employee_hash_index(employee_list)
+
+    save_cache(employee_list, cache_file, hash_index=hash_index)
+    assert get_latest_cache_index(cache_file) == hash_index
+
+    # Saving without an index drops the stale one
+    save_cache(make_employee_list("IT"), cache_file)
+    assert not get_cache_index_file(cache_file).exists()
+    assert get_latest_cache_index(cache_file) is None
+
+
+def test_missing_cache(tmp_path: Path) -> None:
+    assert get_latest_cache(tmp_path / "missing.json") is None
+
+
+def test_is_cache_recent(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    config = CacheConfig(force_refresh_after_seconds=60)
+    assert not is_cache_recent(cache_file, config)
+
+    save_cache(make_employee_list("HR"), cache_file, config)
+    assert is_cache_recent(cache_file, config)
+    assert not is_cache_recent(cache_file, CacheConfig())
+
+
+def test_refresh_only_touches_old_cache(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    config = CacheConfig(force_refresh_after_seconds=60)
+    save_cache(make_employee_list("HR"), cache_file, config)
+    cache_content = cache_file.read_bytes()
+    recent_mtime = cache_file.stat().st_mtime
+    cache = CacheStore(cache_file, config)
+
+    cache.refresh()
+    assert cache_file.stat().st_mtime == recent_mtime
+
+    os.utime(cache_file, (0, 0))
+    cache.refresh()
+    assert is_cache_recent(cache_file, config)
+    assert cache_file.read_bytes() == cache_content
+
+
+def test_cache_store_appends_and_compacts(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    config = CacheConfig(max_entries=2)
+    cache = CacheStore(cache_file, config)
+    departments = ["HR", "IT", "OPS", "FIN"]
+    for department in departments:
+        cache.save(make_employee_list(department))
+
+    # Saves only append until the cache holds twice max_entries
+    assert len(cache_file.read_bytes().splitlines()) == len(departments)
+    assert get_latest_cache(cache_file) == make_employee_list("FIN")
+
+    CacheStore(cache_file, config).save(make_employee_list("LEGAL"))
+    assert load_cache(cache_file) == [
+        make_employee_list("FIN"),
+        make_employee_list("LEGAL"),
+    ]
+
+
+def test_legacy_cache_is_converted(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    legacy_data = {"entries": [make_employee_list("HR").to_dict()]}
+    cache_file.write_text(json.dumps(legacy_data, indent=2))
+    assert get_latest_cache(cache_file) == make_employee_list("HR")
+
+    save_cache(make_employee_list("IT"), cache_file)
+    assert len(cache_file.read_bytes().splitlines()) == len(load_cache(cache_file))
+    assert get_latest_cache(cache_file) == make_employee_list("IT")
+
+
+def test_append_after_interrupted_append(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    save_cache(make_employee_list("HR"), cache_file)
+    with cache_file.open("ab") as f:
+        f.write(b'{"timestamp": "2025-')
+
+    save_cache(make_employee_list("IT"), cache_file)
+    assert load_cache(cache_file) == [
+        make_employee_list("HR"),
+        make_employee_list("IT"),
+    ]
+    assert get_latest_cache(cache_file) == make_employee_list("IT")
+
+
+def test_legacy_cache_with_windows_line_endings(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    legacy_data = {"entries": [make_employee_list("HR").to_dict()]}
+    cache_file.write_bytes(
+        json.dumps(legacy_data, indent=2).encode().replace(b"\n", b"\r\n")
+    )
+    assert load_cache(cache_file) == [make_employee_list("HR")]
+    assert get_latest_cache(cache_file) == make_employee_list("HR")
+
+
+def test_failed_index_write_leaves_no_stale_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_file = tmp_path / "cache.json"
+    hr_list = make_employee_list("HR")
+    save_cache(hr_list, cache_file, hash_index=build_employee_hash_index(hr_list))
+
+    def fail_write_index(*_: object) -> None:
+        raise OSError
+
+    monkeypatch.setattr(CacheStore, "_write_index", fail_write_index)
+    it_list = make_employee_list("IT")
+    save_cache(it_list, cache_file, hash_index=build_employee_hash_index(it_list))
+
+    assert get_latest_cache(cache_file) == it_list
+    assert get_latest_cache_index(cache_file) is None
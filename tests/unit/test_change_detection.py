@@ -1,7 +1,11 @@
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from hibob_monitor.change_detection import compare_employee_lists
+from hibob_monitor.change_detection import (
+    build_employee_hash_index,
+    compare_employee_lists,
+    has_same_content,
+)
 from hibob_monitor.models import (
     Employee,
     EmployeeList,
@@ -87,3 +91,76 @@ def test_no_changes() -> None:
     after = EmployeeList(timestamp=now, count=1, employees=[emp])
     report = compare_employee_lists(after, before)
     assert not report.has_changes
+
+
+def test_hash_index_ignores_ignored_paths() -> None:
+    now = datetime.now(tz=UTC)
+    before = EmployeeList(
+        timestamp=now - timedelta(days=1),
+        count=1,
+        employees=[make_employee("1", "a@x.com", extra={"avatarUrl": "old.png"})],
+    )
+    after = EmployeeList(
+        timestamp=now,
+        count=1,
+        employees=[make_employee("1", "a@x.com", extra={"avatarUrl": "new.png"})],
+    )
+    assert has_same_content(
+        build_employee_hash_index(after), build_employee_hash_index(before)
+    )
+
+
+def test_compare_with_hash_indexes() -> None:
+    now = datetime.now(tz=UTC)
+    before = EmployeeList(
+        timestamp=now - timedelta(days=1),
+        count=2,
+        employees=[
+            make_employee("1", "a@x.com", department="HR"),
+            make_employee("2", "b@x.com", department="HR"),
+        ],
+    )
+    after = EmployeeList(
+        timestamp=now,
+        count=2,
+        employees=[
+            make_employee("1", "a@x.com", department="HR"),
+            make_employee("2", "b@x.com", department="IT"),
+        ],
+    )
+    previous_hashes = build_employee_hash_index(before)
+    assert not has_same_content(build_employee_hash_index(after), previous_hashes)
+
+    report = compare_employee_lists(after, before, previous_hashes)
+    assert [mod.id for mod in report.modified] == ["2"]
+
+
+def test_modified_nested_field_paths() -> None:
+    now = datetime.now(tz=UTC)
+    before = EmployeeList(
+        timestamp=now - timedelta(days=1),
+        count=1,
+        employees=[
+            make_employee(
+                "1",
+                "a@x.com",
+                extra={"avatarUrl": "old.png", "tags": [{"name": "a"}, {"name": "b"}]},
+            )
+        ],
+    )
+    after = EmployeeList(
+        timestamp=now,
+        count=1,
+        employees=[
+            make_employee(
+                "1",
+                "a@x.com",
+                extra={"avatarUrl": "new.png", "tags": [{"name": "a"}, {"name": "c"}]},
+            )
+        ],
+    )
+    report = compare_employee_lists(after, before)
+    assert len(report.modified) == 1
+    assert [str(change) for change in report.modified[0].changes] == [
+        "tags.[1].name: b → c"
+    ]
@@ -3,6 +3,7 @@ from hibob_monitor.cli import (
     StdOutOutputInfo,
     SupportedBrowser,
     create_argument_parser,
+    is_setup_help_requested,
 )
 
 
@@ -18,6 +19,7 @@ def test_parser_defaults() -> None:
     assert args.browser == SupportedBrowser.FIREFOX
     assert args.format == OutputFormat.TABLE
     assert args.stdout_output == StdOutOutputInfo.CHANGES
+    assert not args.quiet
 
 
 def test_parser_opts() -> None:
@@ -37,3 +39,19 @@ def test_parser_opts() -> None:
     assert args.browser == SupportedBrowser.CHROME
     assert args.format == OutputFormat.JSON
     assert args.stdout_output == StdOutOutputInfo.EMPLOYEE_LIST
+
+
+def test_parser_auth_cache() -> None:
+    parser = create_argument_parser()
+    args = parser.parse_args(["--domain", "acme.hibob.com"])
+    assert not args.disable_auth_cache
+    assert args.auth_cache_file.name == ".auth_cache.json"
+
+    args = parser.parse_args(["--domain", "acme.hibob.com", "--disable-auth-cache"])
+    assert args.disable_auth_cache
+
+
+def test_setup_help_requested() -> None:
+    assert is_setup_help_requested(["--setup-help"])
+    assert is_setup_help_requested(["--domain", "acme.hibob.com", "--setup-help"])
+    assert not is_setup_help_requested(["--domain", "acme.hibob.com"])
@@ -0,0 +1,99 @@
+import pytest
+
+from hibob_monitor import employees
+from hibob_monitor.config import API_ENDPOINTS
+from hibob_monitor.employees import get_active_employees
+from hibob_monitor.http_utils import ConditionalResponse
+from hibob_monitor.models import EmployeeList, NotModified, ResponseValidators
+
+BASE_URL = "https://acme.hibob.com"
+EMPLOYEE_DATA = {"employees": [{"id": "1", "email": "a@x.com"}]}
+
+
+def stub_make_conditional_request(
+    monkeypatch: pytest.MonkeyPatch, responses: dict[str, ConditionalResponse]
+) -> list[tuple[str, ResponseValidators | None]]:
+    """Stub make_conditional_request with responses by URL, recording requests."""
+    requested: list[tuple[str, ResponseValidators | None]] = []
+
+    def make_conditional_request(
+        url: str,
+        cookies: dict[str, str] | None = None,  # noqa: ARG001
+        validators: ResponseValidators | None = None,
+    ) -> ConditionalResponse:
+        requested.append((url, validators))
+        return responses.get(url, ConditionalResponse())
+
+    monkeypatch.setattr(employees, "make_conditional_request", make_conditional_request)
+    return requested
+
+
+def test_not_modified_since_last_response(monkeypatch: pytest.MonkeyPatch) -> None:
+    url = f"{BASE_URL}{API_ENDPOINTS[2]}"
+    validators = ResponseValidators(url=url, etag='"v1"')
+    requested = stub_make_conditional_request(
+        monkeypatch,
+        {url: ConditionalResponse(validators=validators, not_modified=True)},
+    )
+
+    result = get_active_employees(BASE_URL, {"session": "abc"}, validators)
+    assert result == NotModified(validators)
+    # The endpoint of the previous response is asked first, and only
+    assert requested == [(url, validators)]
+
+
+def test_modified_since_last_response(monkeypatch: pytest.MonkeyPatch) -> None:
+    url = f"{BASE_URL}{API_ENDPOINTS[2]}"
+    old_validators = ResponseValidators(url=url, etag='"v1"')
+    new_validators = ResponseValidators(url=url, etag='"v2"')
+    stub_make_conditional_request(
+        monkeypatch,
+        {url: ConditionalResponse(data=EMPLOYEE_DATA, validators=new_validators)},
+    )
+
+    result = get_active_employees(BASE_URL, {"session": "abc"}, old_validators)
+    assert isinstance(result, EmployeeList)
+    assert [emp.id for emp in result.employees] == ["1"]
+    assert result.validators == new_validators
+
+
+def test_not_modified_ignored_without_validators(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first_url = f"{BASE_URL}{API_ENDPOINTS[0]}"
+    second_url = f"{BASE_URL}{API_ENDPOINTS[1]}"
+    requested = stub_make_conditional_request(
+        monkeypatch,
+        {
+            first_url: ConditionalResponse(not_modified=True),
+            second_url: ConditionalResponse(data=EMPLOYEE_DATA),
+        },
+    )
+
+    result = get_active_employees(BASE_URL, {"session": "abc"})
+    assert isinstance(result, EmployeeList)
+    assert requested == [(first_url, None), (second_url, None)]
+
+
+def test_no_employee_data(monkeypatch: pytest.MonkeyPatch) -> None:
+    requested = stub_make_conditional_request(monkeypatch, {})
+    assert get_active_employees(BASE_URL, {"session": "abc"}) is None
+    assert len(requested) == len(API_ENDPOINTS)
+
+
+def test_failed_conditional_endpoint_not_retried(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    url = f"{BASE_URL}{API_ENDPOINTS[2]}"
+    validators = ResponseValidators(url=url, etag='"v1"')
+    requested = stub_make_conditional_request(monkeypatch, {})
+
+    assert get_active_employees(BASE_URL, {"session": "abc"}, validators) is None
+    assert [request_url for request_url, _ in requested] == [
+        url,
+        *(
+            f"{BASE_URL}{endpoint}"
+            for endpoint in API_ENDPOINTS
+            if endpoint != API_ENDPOINTS[2]
+        ),
+    ]
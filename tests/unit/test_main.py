@@ -0,0 +1,163 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from hibob_monitor import __main__ as main_module
+from hibob_monitor.cache import (
+    CacheStore,
+    get_latest_cache,
+    is_cache_recent,
+    save_cache,
+)
+from hibob_monitor.change_detection import build_employee_hash_index
+from hibob_monitor.cli import StdOutOutputInfo
+from hibob_monitor.config import DEFAULT_CACHE_CONFIG
+from hibob_monitor.cookies import SupportedBrowser
+from hibob_monitor.models import (
+    EmployeeList,
+    NotModified,
+    ResponseValidators,
+)
+from hibob_monitor.output import OutputFormat, format_employees_as_csv
+
+VALIDATORS = ResponseValidators(url="https://acme.hibob.com/api/people", etag='"v1"')
+
+
+def make_cache(tmp_path: Path) -> tuple[Path, EmployeeList]:
+    cache_file = tmp_path / "cache.json"
+    employee_list = EmployeeList.from_raw_data(
+        [{"id": "1", "email": "a@x.com", "fullName": "Jane Doe"}]
+    )
+    employee_list.validators = VALIDATORS
+    save_cache(
+        employee_list, cache_file, hash_index=build_employee_hash_index(employee_list)
+    )
+    return cache_file, employee_list
+
+
+def stub_not_modified(
+    monkeypatch: pytest.MonkeyPatch,
+) -> list[ResponseValidators | None]:
+    """Stub the fetch to report the data unchanged, recording the validators."""
+    requested_validators: list[ResponseValidators | None] = []
+
+    def fetch_new_employee_list(
+        domain: str,  # noqa: ARG001
+        browser: SupportedBrowser,  # noqa: ARG001
+        auth_cache_file: Path | None = None,  # noqa: ARG001
+        validators: ResponseValidators | None = None,
+    ) -> NotModified:
+        requested_validators.append(validators)
+        assert validators is not None
+        return NotModified(validators)
+
+    monkeypatch.setattr(main_module, "fetch_new_employee_list", fetch_new_employee_list)
+    return requested_validators
+
+
+def test_not_modified_returns_early(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    cache_file, _ = make_cache(tmp_path)
+    cache_content = cache_file.read_bytes()
+    requested_validators = stub_not_modified(monkeypatch)
+
+    def get_latest(_: CacheStore) -> EmployeeList | None:
+        pytest.fail("The cache should not be loaded")
+
+    monkeypatch.setattr(CacheStore, "get_latest", get_latest)
+
+    main_module.run_hibob_monitor(
+        "acme.hibob.com",
+        SupportedBrowser.FIREFOX,
+        cache_file,
+        tmp_path / "changes.log",
+    )
+    assert requested_validators == [VALIDATORS]
+    assert capsys.readouterr().out == ""
+    assert cache_file.read_bytes() == cache_content
+    assert not (tmp_path / "changes.log").exists()
+
+
+def test_not_modified_refreshes_old_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_file, _ = make_cache(tmp_path)
+    cache_content = cache_file.read_bytes()
+    os.utime(cache_file, (0, 0))
+    stub_not_modified(monkeypatch)
+
+    main_module.run_hibob_monitor(
+        "acme.hibob.com",
+        SupportedBrowser.FIREFOX,
+        cache_file,
+        tmp_path / "changes.log",
+    )
+    assert is_cache_recent(cache_file, DEFAULT_CACHE_CONFIG)
+    assert cache_file.read_bytes() == cache_content
+
+
+def test_not_modified_outputs_cached_list(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    cache_file, employee_list = make_cache(tmp_path)
+    cache_content = cache_file.read_bytes()
+    stub_not_modified(monkeypatch)
+    employee_list_path = tmp_path / "employees.csv"
+
+    main_module.run_hibob_monitor(
+        "acme.hibob.com",
+        SupportedBrowser.FIREFOX,
+        cache_file,
+        tmp_path / "changes.log",
+        list_format=OutputFormat.CSV,
+        employee_list_path=employee_list_path,
+        output=StdOutOutputInfo.EMPLOYEE_LIST,
+    )
+    expected_list = format_employees_as_csv(employee_list)
+    assert employee_list_path.read_text(encoding="utf-8", newline="") == expected_list
+    assert capsys.readouterr().err.endswith(expected_list)
+    # Nothing to compare or save: the cache is up to date
+    assert cache_file.read_bytes() == cache_content
+    assert get_latest_cache(cache_file) == employee_list
+    assert not (tmp_path / "changes.log").exists()
+
+
+def test_not_modified_without_cached_list_fetches_again(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    cache_file, employee_list = make_cache(tmp_path)
+    # Only the index survives
+    cache_file.write_bytes(b"")
+    requested_validators: list[ResponseValidators | None] = []
+
+    def fetch_new_employee_list(
+        domain: str,  # noqa: ARG001
+        browser: SupportedBrowser,  # noqa: ARG001
+        auth_cache_file: Path | None = None,  # noqa: ARG001
+        validators: ResponseValidators | None = None,
+    ) -> EmployeeList | NotModified:
+        requested_validators.append(validators)
+        return employee_list if validators is None else NotModified(validators)
+
+    monkeypatch.setattr(main_module, "fetch_new_employee_list", fetch_new_employee_list)
+
+    main_module.run_hibob_monitor(
+        "acme.hibob.com",
+        SupportedBrowser.FIREFOX,
+        cache_file,
+        tmp_path / "changes.log",
+        list_format=OutputFormat.CSV,
+        output=StdOutOutputInfo.EMPLOYEE_LIST,
+    )
+    assert requested_validators == [VALIDATORS, None]
+    assert capsys.readouterr().err.endswith(format_employees_as_csv(employee_list))
+    # Saved again as the first entry of a new cache
+    assert get_latest_cache(cache_file) == employee_list
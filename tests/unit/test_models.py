@@ -1,4 +1,12 @@
-from hibob_monitor.models import Employee
+from dataclasses import replace
+from datetime import UTC, datetime
+
+from hibob_monitor.models import (
+    Employee,
+    EmployeeHashIndex,
+    EmployeeList,
+    ResponseValidators,
+)
 
 
 def test_employee_from_raw_data() -> None:
@@ -16,3 +24,39 @@ def test_employee_from_raw_data() -> None:
     assert emp.status == "active"
     assert emp.department == "R&D"
     assert emp.site == "Paris"
+
+
+def test_employee_email_fallbacks() -> None:
+    work_email = Employee.from_raw_data({"id": "1", "work": {"email": "w@x.com"}})
+    assert work_email.email == "w@x.com"
+
+    personal_email = Employee.from_raw_data(
+        {"id": "2", "work": {}, "personalEmail": "p@x.com"}
+    )
+    assert personal_email.email == "p@x.com"
+
+    no_work = Employee.from_raw_data({"id": "3", "email": "e@x.com", "work": None})
+    assert no_work.email == "e@x.com"
+    assert no_work.department == ""
+
+
+def test_content_hash_memo_not_copied() -> None:
+    emp = Employee.from_raw_data({"id": "1", "email": "a@x.com"})
+    emp.content_hash = "abc"
+    assert replace(emp, raw_data={"id": "1", "email": "b@x.com"}).content_hash is None
+
+
+def test_hash_index_round_trip() -> None:
+    hash_index = EmployeeHashIndex(
+        timestamp=datetime.now(tz=UTC),
+        hashes={("42", "user@example.com"): "abc"},
+        validators=ResponseValidators(
+            url="https://acme.hibob.com/api/employees", etag='"v1"'
+        ),
+    )
+    assert EmployeeHashIndex.from_dict(hash_index.to_dict()) == hash_index
+
+
+def test_employee_list_truthiness() -> None:
+    assert not EmployeeList.from_raw_data([])
+    assert EmployeeList.from_raw_data([{"id": "42", "email": "user@example.com"}])
@@ -0,0 +1,77 @@
+from datetime import UTC, datetime, timedelta
+
+from hibob_monitor.models import (
+    ChangeReport,
+    Employee,
+    EmployeeList,
+    FieldChange,
+    ModifiedEmployee,
+)
+from hibob_monitor.output import (
+    format_change_report_as_text,
+    format_employees_as_csv,
+    format_employees_as_table,
+)
+
+
+def make_employee(id_: str, name: str) -> Employee:
+    return Employee.from_raw_data(
+        {
+            "id": id_,
+            "email": f"{id_}@x.com",
+            "fullName": name,
+            "work": {"department": "R&D", "site": "Paris"},
+        }
+    )
+
+
+def test_change_report_as_text() -> None:
+    now = datetime(2024, 1, 2, 10, 0, 0, tzinfo=UTC)
+    change = FieldChange("work.department", "HR", "R&D")
+    report = ChangeReport(
+        current_timestamp=now,
+        previous_timestamp=now - timedelta(days=1),
+        added=[make_employee("1", "A")],
+        removed=[make_employee("2", "B")],
+        modified=[
+            ModifiedEmployee.from_employee_and_changes(
+                make_employee("3", "C"), [change]
+            )
+        ],
+    )
+    text = format_change_report_as_text(report)
+
+    assert text.startswith(
+        "\n" + "=" * 60 + "\nChanges detected at 2024-01-02 10:00:00"
+    )
+    assert "\n📈 ADDED EMPLOYEES (1):\n  + A (ID: 1, Email: 1@x.com," in text
+    assert "\n📉 REMOVED EMPLOYEES (1):\n  - B (ID: 2," in text
+    assert "  ~ C (ID: 3," in text
+    assert "    work.department: HR → R&D\n" in text
+    assert text.endswith("\nSummary: 1 added, 1 removed, 1 modified\n\n")
+
+
+def test_empty_change_report_as_text() -> None:
+    now = datetime.now(tz=UTC)
+    report = ChangeReport(current_timestamp=now, previous_timestamp=now)
+    assert format_change_report_as_text(report) == "No changes detected."
+
+
+def test_employee_list_as_table_and_csv() -> None:
+    employee = make_employee("1", "A")
+    employee_list = EmployeeList(
+        timestamp=datetime.now(tz=UTC), count=1, employees=[employee]
+    )
+
+    table_lines = format_employees_as_table(employee_list).splitlines()
+    assert table_lines[0].split(" | ") == [
+        "id".ljust(15),
+        "email".ljust(15),
+        "fullName".ljust(15),
+        "work.site".ljust(15),
+        "work.department".ljust(15),
+    ]
+    assert table_lines[2].split(" | ")[3:] == ["Paris".ljust(15), "R&D".ljust(15)]
+
+    csv_output = format_employees_as_csv(employee_list)
+    assert csv_output.splitlines()[0] == "email,fullName,id,work.department,work.site"